@@ -0,0 +1,255 @@
+"""
+Benchmarks for `NestedForm` and the DRF parsers
+
+Synthetic payloads are generated along several axes (key count, nesting
+depth, list width, namespace count, sparse indices and file count) and
+timed with `NestedForm.is_nested()` and end to end through the parsers.
+The results are written as JSON so runs of different versions can be
+compared
+
+    python benchmarks/run.py --output before.json
+    python benchmarks/run.py --output after.json --compare before.json
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import django  # noqa: E402
+from django.conf import settings  # noqa: E402
+
+if not settings.configured:
+    settings.configure(
+        SECRET_KEY='benchmarks',
+        DATA_UPLOAD_MAX_NUMBER_FIELDS=None,
+        DATA_UPLOAD_MAX_NUMBER_FILES=None,
+        DATA_UPLOAD_MAX_MEMORY_SIZE=None,
+        INSTALLED_APPS=['rest_framework'],
+    )
+    django.setup()
+
+from django.core.files.uploadedfile import SimpleUploadedFile  # noqa: E402
+from django.test.client import (  # noqa: E402
+    MULTIPART_CONTENT, RequestFactory, encode_multipart, BOUNDARY
+)
+from rest_framework.request import Request  # noqa: E402
+
+import drf_nested_forms  # noqa: E402
+from drf_nested_forms.parsers import (  # noqa: E402
+    NestedJSONParser, NestedMultiPartParser
+)
+from drf_nested_forms.utils import NestedForm  # noqa: E402
+
+
+# Payload generators
+# -------------------
+
+def key_count_payload(size):
+    """
+    `size` leaves spread over records of ten fields
+    """
+    return {
+        'items[%d][field_%d]' % (position // 10, position % 10): str(position)
+        for position in range(size)
+    }
+
+
+def depth_payload(size):
+    """
+    a hundred keys nested `size` levels deep
+    """
+    path = ''.join('[level_%d]' % depth for depth in range(size))
+
+    return {
+        'config%s[leaf_%d]' % (path, position): 'true'
+        for position in range(100)
+    }
+
+
+def list_width_payload(size):
+    """
+    a list of `size` scalars
+    """
+    return {'tags[%d]' % position: 'tag' for position in range(size)}
+
+
+def namespace_payload(size):
+    """
+    `size` namespaces with five fields each
+    """
+    return {
+        'ns_%d[field_%d]' % (namespace, field): 'value'
+        for namespace in range(size)
+        for field in range(5)
+    }
+
+
+def sparse_payload(size):
+    """
+    `size` lists that only have their last index out of a hundred
+    """
+    return {'sparse_%d[99]' % position: 'value' for position in range(size)}
+
+
+def file_payload(size):
+    """
+    `size` files each with a caption
+    """
+    data = {}
+
+    for position in range(size):
+        data['gallery[%d][caption]' % position] = 'caption'
+        data['gallery[%d][image]' % position] = SimpleUploadedFile(
+            'image_%d.jpeg' % position, b'0' * 256, content_type='image/jpeg'
+        )
+
+    return data
+
+
+AXES = {
+    'key_count': (key_count_payload, [100, 1000, 10000]),
+    'depth': (depth_payload, [2, 6, 12]),
+    'list_width': (list_width_payload, [100, 1000, 10000]),
+    'namespace_count': (namespace_payload, [10, 100, 1000]),
+    'sparse_indices': (sparse_payload, [10, 100, 1000]),
+    'file_count': (file_payload, [1, 10, 100]),
+}
+
+
+# Timers
+# -------
+
+def measure(function, repeat):
+    timings = []
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+
+    return {
+        'min': min(timings),
+        'median': statistics.median(timings),
+        'repeat': repeat,
+    }
+
+
+def time_nested_form(data, repeat):
+    def run():
+        form = NestedForm(data)
+        form.is_nested()
+        return form.data
+
+    return measure(run, repeat)
+
+
+def time_parser(parser_class, body, content_type, repeat):
+    factory = RequestFactory()
+
+    def run():
+        request = factory.generic('POST', '/', body, content_type=content_type)
+        return Request(request, parsers=[parser_class()]).data
+
+    return measure(run, repeat)
+
+
+def multipart_body(data):
+    for value in data.values():
+        if hasattr(value, 'seek'):
+            value.seek(0)
+
+    return encode_multipart(BOUNDARY, data)
+
+
+def run_benchmarks(axes, repeat):
+    results = []
+
+    for axis in axes:
+        payload, sizes = AXES[axis]
+
+        for size in sizes:
+            data = payload(size)
+            has_files = any(hasattr(value, 'read') for value in data.values())
+            cases = {
+                'multipart_parser': time_parser(
+                    NestedMultiPartParser, multipart_body(data),
+                    MULTIPART_CONTENT, repeat
+                )
+            }
+
+            if not has_files:
+                cases['nested_form'] = time_nested_form(data, repeat)
+                cases['json_parser'] = time_parser(
+                    NestedJSONParser, json.dumps(data).encode('utf-8'),
+                    'application/json', repeat
+                )
+
+            for case, timing in sorted(cases.items()):
+                results.append(dict({
+                    'name': '%s/%s/%d' % (axis, case, size),
+                    'axis': axis,
+                    'case': case,
+                    'size': size,
+                    'keys': len(data),
+                }, **timing))
+
+    return {
+        'version': drf_nested_forms.__version__,
+        'python': platform.python_version(),
+        'django': django.get_version(),
+        'results': results,
+    }
+
+
+def compare(current, previous):
+    """
+    Print how much faster or slower every case is than the previous run
+    """
+    previous_results = {
+        result['name']: result for result in previous['results']
+    }
+
+    print('%-45s %12s %12s %8s' % ('case', 'previous', 'current', 'ratio'))
+
+    for result in current['results']:
+        before = previous_results.get(result['name'])
+
+        if before is None:
+            continue
+
+        print('%-45s %12.6f %12.6f %7.2fx' % (
+            result['name'], before['median'], result['median'],
+            before['median'] / result['median']
+        ))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--axis', action='append', choices=sorted(AXES),
+                        help='only run the given axis, can be repeated')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--output', help='write the results to this file')
+    parser.add_argument('--compare', help='results of a previous run')
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.axis or list(AXES), args.repeat)
+    output = json.dumps(results, indent=2)
+
+    if args.output:
+        with open(args.output, 'w') as file:
+            file.write(output)
+    else:
+        print(output)
+
+    if args.compare:
+        with open(args.compare) as file:
+            compare(results, json.load(file))
+
+
+if __name__ == '__main__':
+    main()
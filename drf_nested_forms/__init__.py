@@ -6,8 +6,30 @@ __copyright__ = 'Copyright 2021'
 
 # Version synonym
 from .exceptions import ParseError
-from .parsers import NestedMultiPartParser, NestedJSONParser
 from .mixins import UtilityMixin
-from .utils import NestedForm
+from .utils import NestedForm, NestedFormBatch, NestedFormBuilder, decode_many
 
 VERSION = __version__
+
+# The parsers need django and DRF, they are only imported when first
+# used so the decoder can be used without them
+_lazy_imports = {
+    'NestedMultiPartParser': 'parsers',
+    'NestedJSONParser': 'parsers',
+    'NestedFormParser': 'parsers',
+}
+
+
+def __getattr__(name):
+    if name in _lazy_imports:
+        from importlib import import_module
+
+        module = import_module('.' + _lazy_imports[name], __name__)
+        value = globals()[name] = getattr(module, name)
+        return value
+
+    raise AttributeError('module %r has no attribute %r' % (__name__, name))
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_lazy_imports))
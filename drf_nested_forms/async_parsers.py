@@ -0,0 +1,297 @@
+"""
+Parsers for ASGI deployments, the body is read without blocking the
+event loop and large forms are decoded in an executor. The result is
+the same as the one of the sync parsers
+"""
+import asyncio
+import functools
+import inspect
+import time
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+
+from django.conf import settings
+from django.http import QueryDict
+from django.utils.datastructures import MultiValueDict
+from rest_framework.exceptions import ParseError, UnsupportedMediaType
+from rest_framework.negotiation import DefaultContentNegotiation
+from rest_framework.parsers import DataAndFiles, MultiPartParser
+from rest_framework.request import is_form_media_type
+
+from .cache import MISSING, get_cache_key, report_cached, store_result
+from .exceptions import ParseError as NestedParseError
+from .parsers import (
+    NestedJSONParser, NestedMultiPartParser, collect_multi_value_items,
+    get_plan
+)
+from .plans import PlannedNestedForm
+from .settings import api_settings
+from .tokenizer import key_cache
+from .utils import NestedForm
+
+
+THREAD = 'thread'
+PROCESS = 'process'
+
+_process_pool = None
+
+
+def get_process_pool():
+    """
+    Return the process pool shared by the async parsers, it is
+    created the first time it is needed
+    """
+    global _process_pool
+
+    if _process_pool is None:
+        _process_pool = ProcessPoolExecutor()
+
+    return _process_pool
+
+
+async def read_body(stream, chunk_size=64 * 1024):
+    """
+    Read the body a chunk at a time giving the event loop a turn between
+    chunks, a stream with an async `read` is awaited
+    """
+    if stream is None:
+        return b''
+
+    chunks = []
+
+    while True:
+        chunk = stream.read(chunk_size)
+
+        if inspect.isawaitable(chunk):
+            chunk = await chunk
+
+        if not chunk:
+            break
+
+        chunks.append(chunk)
+        await asyncio.sleep(0)
+
+    return b''.join(chunks)
+
+
+def decode_in_process(data, options, plan=None):
+    """
+    Decode a flat mapping in a worker process, returns whether
+    it was nested and the decoded object
+    """
+    if plan is not None:
+        form = PlannedNestedForm(data, plan, **options)
+    else:
+        form = NestedForm(data, **options)
+
+    if form.is_nested():
+        return True, form.data
+
+    return False, None
+
+
+class AsyncParserMixin:
+    """
+    Adds `aparse()` to a nested parser. Bodies of at least
+    `executor_threshold` bytes are decoded in the `executor`, `'thread'`
+    runs the whole parse in a thread while `'process'` only sends the
+    decoding of forms without files to a process pool
+    """
+    executor = api_settings.ASYNC_EXECUTOR
+    executor_threshold = api_settings.ASYNC_EXECUTOR_THRESHOLD
+    chunk_size = 64 * 1024
+
+    async def aparse(self, stream, media_type=None, parser_context=None):
+        start = time.perf_counter()
+        body = await read_body(stream, self.chunk_size)
+        executor = self.executor
+
+        if len(body) < self.executor_threshold:
+            executor = None
+
+        if executor is None:
+            return self.parse(BytesIO(body), media_type, parser_context)
+
+        loop = asyncio.get_running_loop()
+
+        if executor == PROCESS and self.decodes_in_process(parser_context):
+            return await self._aparse_cached(
+                loop, start, body, media_type, parser_context
+            )
+
+        return await loop.run_in_executor(
+            None if executor in (THREAD, PROCESS) else executor,
+            functools.partial(
+                self.parse, BytesIO(body), media_type, parser_context
+            )
+        )
+
+    def decodes_in_process(self, parser_context):
+        """
+        Whether the `'process'` executor sends the decoding to the
+        process pool, the whole parse runs in a thread otherwise
+        """
+        return True
+
+    async def _aparse_cached(self, loop, start, body, media_type,
+                             parser_context):
+        """
+        Look up the body in the result cache the way `parse()` does,
+        the cache is used from a thread as it may be a django cache
+        """
+        cache = self.get_result_cache()
+        key = None
+
+        if cache is not None and len(body) <= self.max_cached_body:
+            key = get_cache_key(self, body, media_type, parser_context)
+
+        if key is not None:
+            data = await loop.run_in_executor(
+                None, functools.partial(cache.get, key, MISSING)
+            )
+
+            if data is not MISSING:
+                report_cached(
+                    self, parser_context, data, time.perf_counter() - start
+                )
+                return data
+
+        data = await self._aparse_in_process(
+            loop, start, BytesIO(body), media_type, parser_context
+        )
+
+        if key is not None:
+            await loop.run_in_executor(
+                None, functools.partial(store_result, cache, key, data)
+            )
+
+        return data
+
+    async def _adecode_in_process(self, loop, data, plan,
+                                  error='Nested form parse error'):
+        try:
+            return await loop.run_in_executor(
+                get_process_pool(),
+                functools.partial(decode_in_process, data, self.options, plan)
+            )
+        except NestedParseError as exc:
+            raise ParseError('%s - %s' % (error, str(exc)))
+
+
+class AsyncNestedMultiPartParser(AsyncParserMixin, NestedMultiPartParser):
+    """
+    `NestedMultiPartParser` with an async `aparse()`
+    """
+
+    async def _aparse_in_process(self, loop, start, stream, media_type,
+                                 parser_context):
+        plan = get_plan(parser_context)
+        # django's multipart parser reads the files to disk
+        parsed = await loop.run_in_executor(
+            None, functools.partial(
+                MultiPartParser.parse, self, stream, media_type,
+                parser_context
+            )
+        )
+        decode_start = time.perf_counter()
+        nested = any(
+            key_cache.tokenize(key).nested
+            for multi_value_dict in (parsed.data, parsed.files)
+            for key in multi_value_dict
+        )
+
+        if not nested:
+            data = parsed
+        elif parsed.files:
+            # uploaded files cannot be sent to another process
+            data = await loop.run_in_executor(
+                None, functools.partial(self._decode_safely, parsed, plan)
+            )
+        else:
+            data = (await self._adecode_in_process(
+                loop, collect_multi_value_items(parsed.data), plan
+            ))[1]
+
+        fast_path = isinstance(data, DataAndFiles)
+
+        self.report(
+            parser_context, data, len(parsed.data) + len(parsed.files),
+            decode_start - start, time.perf_counter() - decode_start,
+            fast_path, parsed.files if fast_path else None
+        )
+
+        return data
+
+    def decodes_in_process(self, parser_context):
+        # a streamed form is decoded while the parts are read
+        return not self.streaming or get_plan(parser_context) is not None
+
+    def _decode_safely(self, parsed, plan):
+        try:
+            return self._decode(parsed, plan)
+        except NestedParseError as exc:
+            raise ParseError('Nested form parse error - %s' % str(exc))
+
+
+class AsyncNestedJSONParser(AsyncParserMixin, NestedJSONParser):
+    """
+    `NestedJSONParser` with an async `aparse()`
+    """
+
+    async def _aparse_in_process(self, loop, start, stream, media_type,
+                                 parser_context):
+        # decoding the JSON body is the costly part of the base parse
+        parsed, bracketed = await loop.run_in_executor(
+            None, functools.partial(self.load, stream, parser_context)
+        )
+        decode_start = time.perf_counter()
+        data = parsed
+        key_count = len(parsed) if isinstance(parsed, dict) else 0
+
+        if bracketed and self.may_be_nested(parsed):
+            nested, decoded = await self._adecode_in_process(
+                loop, parsed, get_plan(parser_context), 'JSON parse error'
+            )
+
+            if nested:
+                data = decoded
+
+        self.report(
+            parser_context, data, key_count, decode_start - start,
+            time.perf_counter() - decode_start, data is parsed
+        )
+
+        return data
+
+
+async def aparse_request(request, parsers, view=None):
+    """
+    Parse the body of a django request with the first of the parsers
+    that accepts its content type, returns `(data, files)` the same
+    way `request.data` and `request.FILES` of DRF are filled
+    """
+    # the content type with its parameters like the multipart boundary
+    media_type = request.META.get('CONTENT_TYPE', '')
+
+    if not media_type or not int(request.META.get('CONTENT_LENGTH') or 0):
+        if media_type and is_form_media_type(media_type):
+            return QueryDict('', encoding=request.encoding), MultiValueDict()
+
+        return {}, MultiValueDict()
+
+    parser = DefaultContentNegotiation().select_parser(request, parsers)
+
+    if parser is None:
+        raise UnsupportedMediaType(media_type)
+
+    parser_context = {
+        'request': request,
+        'view': view,
+        'encoding': request.encoding or settings.DEFAULT_CHARSET,
+    }
+    parsed = await parser.aparse(request, media_type, parser_context)
+
+    if isinstance(parsed, DataAndFiles):
+        return parsed.data, parsed.files
+
+    return parsed, MultiValueDict()
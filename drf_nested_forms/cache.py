@@ -0,0 +1,227 @@
+"""
+Cache of parsed results keyed by a digest of the body, retried and
+duplicate submissions are decoded once
+"""
+import functools
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from io import BytesIO
+
+from django.core.cache import caches
+from rest_framework.parsers import DataAndFiles
+
+from .helpers import copy_data
+from .settings import api_settings
+
+
+LOCMEM = 'locmem'
+
+MISSING = object()
+
+
+def describe_option(value):
+    """
+    A repr of an option that does not change between processes, a
+    function or class is named by its import path
+    """
+    if isinstance(value, dict):
+        return '{%s}' % ', '.join(sorted(
+            '%s: %s' % (describe_option(key), describe_option(item))
+            for key, item in value.items()
+        ))
+    elif isinstance(value, (list, tuple)):
+        return '[%s]' % ', '.join(describe_option(item) for item in value)
+    elif hasattr(value, '__qualname__'):
+        return '%s.%s' % (value.__module__, value.__qualname__)
+
+    return repr(value)
+
+
+def get_digest(parser, media_type, encoding, body):
+    """
+    Cache key of a body for a parser, the content type holds the
+    multipart boundary. Parsers with the same name in other modules
+    or with other options never share a key
+    """
+    digest = hashlib.blake2b(digest_size=20)
+    parts = (
+        describe_option(type(parser)),
+        describe_option(getattr(parser, 'options', None)),
+        media_type or '',
+        encoding or '',
+    )
+
+    for part in parts:
+        digest.update(part.encode('utf-8'))
+        digest.update(b'\0')
+
+    digest.update(body)
+
+    return 'drf_nested_forms:%s' % digest.hexdigest()
+
+
+def copy_result(data):
+    """
+    Copy a parsed result so the cached one is never changed
+    """
+    if isinstance(data, DataAndFiles):
+        return DataAndFiles(data.data.copy(), data.files.copy())
+
+    return copy_data(data)
+
+
+class ResultCache:
+    """
+    A bounded least recently used cache of parsed results in the
+    memory of the process, the results expire after `timeout` seconds
+    """
+
+    def __init__(self, maxsize, timeout):
+        self.maxsize = maxsize
+        self.timeout = timeout
+        self._results = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._results.get(key)
+
+            if entry is None:
+                return default
+            elif entry[0] < time.monotonic():
+                del self._results[key]
+                return default
+
+            self._results.move_to_end(key)
+
+        return copy_result(entry[1])
+
+    def set(self, key, value, timeout=None):
+        timeout = self.timeout if timeout is None else timeout
+        entry = (time.monotonic() + timeout, value)
+
+        with self._lock:
+            self._results[key] = entry
+            self._results.move_to_end(key)
+
+            while len(self._results) > self.maxsize:
+                self._results.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._results.clear()
+
+
+_result_cache = None
+
+
+def get_result_cache():
+    """
+    Return the cache set by `RESULT_CACHE`, `'locmem'` keeps the
+    results in the process and any other name is a django cache
+    """
+    global _result_cache
+
+    backend = api_settings.RESULT_CACHE
+
+    if not backend:
+        return None
+    elif backend != LOCMEM:
+        return caches[backend]
+    elif _result_cache is None:
+        _result_cache = ResultCache(
+            api_settings.RESULT_CACHE_SIZE, api_settings.RESULT_CACHE_TIMEOUT
+        )
+
+    return _result_cache
+
+
+class ResultCacheMixin:
+    """
+    Lets a parser return a copy of the result of an earlier parse of
+    the same body, bodies over `RESULT_CACHE_MAX_BODY` bytes or with
+    file parts are always parsed
+    """
+    max_cached_body = api_settings.RESULT_CACHE_MAX_BODY
+
+    def get_result_cache(self):
+        return get_result_cache()
+
+
+def get_cache_key(parser, body, media_type, parser_context):
+    """
+    Cache key of a body, `None` for a body that is not cached
+    """
+    # the files are not cached, a file part has a filename
+    if b'filename=' in body:
+        return None
+
+    return get_digest(
+        parser, media_type, (parser_context or {}).get('encoding'), body
+    )
+
+
+def store_result(cache, key, data):
+    """
+    Keep a copy of a parsed result unless it holds files
+    """
+    if not isinstance(data, DataAndFiles) or not data.files:
+        cache.set(key, copy_result(data), api_settings.RESULT_CACHE_TIMEOUT)
+
+
+def report_cached(parser, parser_context, data, lookup_time):
+    """
+    Report a result taken from the cache, the form is not read so the
+    key count is `0` and nothing is decoded
+    """
+    fast_path = isinstance(data, DataAndFiles)
+
+    parser.report(
+        parser_context, data, 0, lookup_time, 0, fast_path,
+        data.files if fast_path else None, cached=True
+    )
+
+
+def cache_result(parse):
+    """
+    Decorate the `parse()` of a parser with `ResultCacheMixin` to look
+    up the body in the result cache before parsing it, the parser also
+    reports the results taken from the cache
+    """
+    @functools.wraps(parse)
+    def cached_parse(self, stream, media_type=None, parser_context=None):
+        start = time.perf_counter()
+        cache = self.get_result_cache()
+        request = (parser_context or {}).get('request')
+        meta = getattr(request, 'META', {})
+
+        try:
+            content_length = int(meta.get('CONTENT_LENGTH') or -1)
+        except ValueError:
+            content_length = -1
+
+        if cache is None or not 0 <= content_length <= self.max_cached_body:
+            return parse(self, stream, media_type, parser_context)
+
+        body = stream.read()
+        key = get_cache_key(self, body, media_type, parser_context)
+
+        if key is None:
+            return parse(self, BytesIO(body), media_type, parser_context)
+
+        data = cache.get(key, MISSING)
+
+        if data is not MISSING:
+            report_cached(
+                self, parser_context, data, time.perf_counter() - start
+            )
+            return data
+
+        data = parse(self, BytesIO(body), media_type, parser_context)
+        store_result(cache, key, data)
+
+        return data
+
+    return cached_parse
@@ -0,0 +1,198 @@
+"""
+Table driven coercion of form values, a value is dispatched on its
+first character and length to the coercers registered for it
+"""
+import sys
+from functools import lru_cache
+
+from .exceptions import ParseError
+from .helpers import short_key
+from .tokenizer import (
+    APPEND, DEFAULT_KEY_CACHE_SIZE, LIST, MAX_CACHED_KEY_LENGTH
+)
+
+
+# returned by a coercer that does not apply to a value
+NOT_COERCED = object()
+
+DIGITS = '0123456789'
+
+# longest digit string converted to an `int`, python refuses longer
+# strings by default
+DEFAULT_MAX_DIGITS = getattr(sys.int_info, 'default_max_str_digits', 4300)
+
+
+def coerce_float(string):
+    """
+    Coerce a decimal number like `12.5` or `-3` to a `float`
+    """
+    try:
+        return float(string) if string[-1] in DIGITS else NOT_COERCED
+    except ValueError:
+        return NOT_COERCED
+
+
+def coerce_decimal(string):
+    """
+    Coerce a decimal number like `12.50` to a `Decimal`
+    """
+    import decimal
+
+    try:
+        value = decimal.Decimal(string)
+    except decimal.InvalidOperation:
+        return NOT_COERCED
+
+    return value if value.is_finite() else NOT_COERCED
+
+
+def coerce_iso_datetime(string):
+    """
+    Coerce an ISO 8601 date like `2021-05-01` to a `date` and a date
+    with a time to a `datetime`
+    """
+    import datetime
+
+    try:
+        if len(string) == 10:
+            return datetime.date.fromisoformat(string)
+
+        return datetime.datetime.fromisoformat(string)
+    except ValueError:
+        return NOT_COERCED
+
+
+class CoercionTable:
+    """
+    Coercers of string values keyed by the first character they apply
+    to, with the length of the strings they apply to or `None` for any
+    length. The first coercer that applies wins
+    """
+
+    def __init__(self, max_digits=DEFAULT_MAX_DIGITS):
+        self.max_digits = max_digits
+        # every entry is `(length, literal, coercer)`
+        self._table = {}
+
+    def _add(self, characters, entry):
+        for character in characters:
+            self._table[character] = self._table.get(character, ()) + (entry,)
+
+    def register(self, characters, coercer, length=None):
+        """
+        Register a coercer for strings starting with any of the
+        characters, the coercer returns `NOT_COERCED` when it does
+        not apply
+        """
+        self._add(characters, (length, None, coercer))
+
+    def register_literal(self, string, value):
+        """
+        Register the value of a single string, a `list` or `dict`
+        value is copied for every coerced string
+        """
+        if isinstance(value, (list, dict)):
+            factory = type(value)
+        else:
+            factory = lambda: value
+
+        self._add(string[0], (len(string), string, factory))
+
+    def register_int(self):
+        """
+        Register the coercer of ascii digit strings no longer
+        than `max_digits` to an `int`
+        """
+        self._add(DIGITS, (None, None, None))
+
+    def copy(self, **kwargs):
+        table = CoercionTable(kwargs.get('max_digits', self.max_digits))
+        table._table = dict(self._table)
+
+        return table
+
+    def coerce(self, value):
+        # we have no interest in any value that is not a string
+        if not isinstance(value, str) or not value:
+            return value
+
+        entries = self._table.get(value[0])
+
+        if entries is None:
+            return value
+
+        for length, string, coercer in entries:
+            if length is not None and length != len(value):
+                continue
+            elif string is not None:
+                if value == string:
+                    return coercer()
+            elif coercer is None:
+                if (
+                    len(value) <= self.max_digits
+                    and value.isdigit()
+                    and value.isascii()
+                ):
+                    return int(value)
+            else:
+                coerced = coercer(value)
+
+                if coerced is not NOT_COERCED:
+                    return coerced
+
+        return value
+
+
+def get_default_table():
+    """
+    The coercers of the special strings `null`, `true`, `false`, `[]`
+    and `{}` and of whole numbers
+    """
+    table = CoercionTable()
+    table.register_literal('null', None)
+    table.register_literal('true', True)
+    table.register_literal('false', False)
+    table.register_literal('[]', [])
+    table.register_literal('{}', {})
+    table.register_int()
+
+    return table
+
+
+default_table = get_default_table()
+
+
+def key_path(parsed):
+    """
+    The path of a parsed key for per path coercers, list indices are
+    left out e.g `items[3][price]` gives `items[][price]`
+    """
+    if len(parsed.key) > MAX_CACHED_KEY_LENGTH:
+        return _key_path(parsed)
+
+    return _cached_key_path(parsed)
+
+
+def _key_path(parsed):
+    if not parsed.nested:
+        return parsed.key
+
+    return (parsed.namespace or '') + ''.join(
+        '[]' if step.kind in (LIST, APPEND) else '[%s]' % step.index
+        for step in parsed.steps
+    )
+
+
+_cached_key_path = lru_cache(maxsize=DEFAULT_KEY_CACHE_SIZE)(_key_path)
+
+
+def coerce_path(coercer, parsed, value):
+    """
+    Apply a per path coercer, a value it cannot coerce is a parse error
+    """
+    try:
+        return coercer(value)
+    except (ArithmeticError, TypeError, ValueError):
+        raise ParseError(
+            'value of `%s` is not valid !' % short_key(parsed.key)
+        )
@@ -0,0 +1,150 @@
+"""
+Encoders for nested objects, the inverse of `NestedForm`. Objects are
+walked lazily so large payloads are never flattened into a dict
+"""
+import os
+import re
+import uuid
+
+from .helpers import is_dict, is_list
+
+
+_word_re = re.compile(r'\w+')
+
+
+def encode_value(value):
+    """
+    Encode a value the way `replace_special` decodes it, `None`,
+    booleans and empty lists and dicts use the special strings
+    """
+    if value is None:
+        return 'null'
+    elif value is True:
+        return 'true'
+    elif value is False:
+        return 'false'
+    elif is_list(value):
+        return '[]'
+    elif is_dict(value):
+        return '{}'
+    elif isinstance(value, (str, bytes)) or hasattr(value, 'read'):
+        # bytes and files are sent as they are
+        return value
+
+    return str(value)
+
+
+def _child_items(key, value):
+    if is_dict(value):
+        for child_key, child_value in value.items():
+            yield '%s[%s]' % (key, child_key), child_value
+    else:
+        for index, child_value in enumerate(value):
+            yield '%s[%d]' % (key, index), child_value
+
+
+def _root_items(data):
+    if is_list(data):
+        yield from _child_items('', data)
+        return
+
+    for key, value in data.items():
+        if (is_dict(value) or is_list(value)) and value:
+            # a key that cannot be a namespace is sent as a dict step
+            if not _word_re.fullmatch(key):
+                key = '[%s]' % key
+
+        yield key, value
+
+
+def iter_nested_items(data):
+    """
+    Yield the `(key, value)` pairs of a nested dict or list, e.g
+    `{'item': {'tags': ['new']}}` gives `('item[tags][0]', 'new')`.
+    Only the path to the current value is held in memory
+    """
+    if not is_dict(data) and not is_list(data):
+        raise ValueError('`data` is not a dict or a list')
+
+    stack = [_root_items(data)]
+
+    while stack:
+        try:
+            key, value = next(stack[-1])
+        except StopIteration:
+            stack.pop()
+            continue
+
+        if (is_dict(value) or is_list(value)) and value:
+            stack.append(_child_items(key, value))
+        else:
+            yield key, encode_value(value)
+
+
+class MultiPartEncoder:
+    """
+    Iterable of the chunks of a `multipart/form-data` body for
+    a nested object, files are read a chunk at a time
+    """
+    chunk_size = 64 * 1024
+
+    def __init__(self, data, boundary=None, encoding='utf-8'):
+        self.data = data
+        self.boundary = boundary or uuid.uuid4().hex
+        self.encoding = encoding
+
+    @property
+    def content_type(self):
+        return 'multipart/form-data; boundary=%s' % self.boundary
+
+    def __iter__(self):
+        delimiter = ('--%s\r\n' % self.boundary).encode('ascii')
+
+        for key, value in iter_nested_items(self.data):
+            yield delimiter
+
+            if hasattr(value, 'read'):
+                yield self._headers(key, value)
+                yield from self._read(value)
+            elif isinstance(value, bytes):
+                yield self._headers(key) + value
+            else:
+                yield self._headers(key) + value.encode(self.encoding)
+
+            yield b'\r\n'
+
+        yield ('--%s--\r\n' % self.boundary).encode('ascii')
+
+    @staticmethod
+    def _quote(string):
+        return (
+            string.replace('"', '%22').replace('\r', '%0D').replace('\n', '%0A')
+        )
+
+    def _headers(self, key, file=None):
+        disposition = 'Content-Disposition: form-data; name="%s"' % (
+            self._quote(key)
+        )
+
+        if file is None:
+            return ('%s\r\n\r\n' % disposition).encode(self.encoding)
+
+        filename = os.path.basename(getattr(file, 'name', None) or key)
+        content_type = (
+            getattr(file, 'content_type', None) or 'application/octet-stream'
+        )
+
+        return ('%s; filename="%s"\r\nContent-Type: %s\r\n\r\n' % (
+            disposition, self._quote(filename), content_type
+        )).encode(self.encoding)
+
+    def _read(self, file):
+        while True:
+            chunk = file.read(self.chunk_size)
+
+            if not chunk:
+                break
+            elif isinstance(chunk, str):
+                chunk = chunk.encode(self.encoding)
+
+            yield chunk
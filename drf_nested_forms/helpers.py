@@ -1,4 +1,6 @@
-   
+from functools import lru_cache
+
+
 def is_dict(obj):
     """
     Check if object is a dictionary
@@ -10,4 +12,107 @@ def is_list(obj):
     """
     Check if object is a list
     """
-    return isinstance(obj, list)
\ No newline at end of file
+    return isinstance(obj, list)
+
+def copy_tree(tree):
+    """
+    Copy the lists and dicts of a decoded object, the values
+    are shared since they are never changed in place
+    """
+    if not is_dict(tree) and not is_list(tree):
+        return tree
+
+    root = {} if is_dict(tree) else []
+    stack = [(tree, root)]
+
+    while stack:
+        source, target = stack.pop()
+        items = source.items() if is_dict(source) else enumerate(source)
+
+        for key, value in items:
+            if is_dict(value):
+                child = {}
+                stack.append((value, child))
+            elif is_list(value):
+                child = []
+                stack.append((value, child))
+            else:
+                child = value
+
+            if is_list(target):
+                target.append(child)
+            else:
+                target[key] = child
+
+    return root
+
+
+def copy_data(data):
+    """
+    Copy a decoded object or a `QueryDict` so the one that is cached is
+    never changed by the caller
+    """
+    if hasattr(data, 'getlist'):
+        return data.copy()
+
+    return copy_tree(data)
+
+
+class LRUCache:
+    """
+    A bounded least recently used cache of the results of a function
+    shared across requests
+    """
+
+    def __init__(self, function, maxsize=None):
+        self.function = function
+        self.configure(maxsize)
+
+    def configure(self, maxsize):
+        """
+        Set the size limit of the cache, a `maxsize` of `0` or `None`
+        disables caching. Configuring the cache empties it
+        """
+        self.maxsize = maxsize
+
+        if maxsize:
+            self._cached = lru_cache(maxsize=maxsize)(self.function)
+        else:
+            self._cached = self.function
+
+    def __call__(self, *args):
+        return self._cached(*args)
+
+    def clear(self):
+        """
+        Empty the cache and reset the counters
+        """
+        if self.maxsize:
+            self._cached.cache_clear()
+
+    def info(self):
+        """
+        Return the hit and miss counters used in sizing the cache
+        """
+        if not self.maxsize:
+            return {'hits': 0, 'misses': 0, 'maxsize': 0, 'currsize': 0}
+
+        hits, misses, maxsize, currsize = self._cached.cache_info()
+
+        return {
+            'hits': hits,
+            'misses': misses,
+            'maxsize': maxsize,
+            'currsize': currsize
+        }
+
+
+def short_key(key, length=64):
+    """
+    Shorten a key for an error message, keys are sent by the client
+    and can be of any length
+    """
+    if len(key) > length:
+        return key[:length] + '...'
+
+    return key
@@ -0,0 +1,59 @@
+"""
+Timings and the shape of parsed forms reported to the parse hook
+"""
+from collections import namedtuple
+
+from .helpers import is_dict, is_list
+
+
+ParseStats = namedtuple('ParseStats', [
+    'parser',           # name of the parser class
+    'base_time',        # seconds spent in the base parser
+    'decode_time',      # seconds spent decoding the nested form
+    'key_count',        # number of keys of the form
+    'max_depth',        # deepest nesting of the decoded object
+    'node_count',       # number of lists, dicts and values decoded
+    'file_count',       # number of uploaded files
+    'fast_path',        # whether the form was returned without decoding
+    'cached',           # whether the result was taken from the result cache
+], defaults=(False,))
+
+
+def measure_tree(tree):
+    """
+    Return the node count, maximum depth and file count of
+    a decoded object in a single walk
+    """
+    node_count = max_depth = file_count = 0
+    stack = [(tree, 0)]
+
+    while stack:
+        node, depth = stack.pop()
+
+        if is_dict(node):
+            # `dict.values` does not decode the namespaces of a lazy tree
+            children = dict.values(node)
+        elif is_list(node):
+            children = node
+        else:
+            if hasattr(node, 'read'):
+                file_count += 1
+            continue
+
+        depth += 1
+        max_depth = max(max_depth, depth)
+
+        for child in children:
+            node_count += 1
+            stack.append((child, depth))
+
+    return node_count, max_depth, file_count
+
+
+def server_timing(stats):
+    """
+    Format the timings as a `Server-Timing` header value
+    """
+    return 'nested-parse;dur=%.3f, nested-decode;dur=%.3f' % (
+        stats.base_time * 1000, stats.decode_time * 1000
+    )
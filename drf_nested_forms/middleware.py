@@ -0,0 +1,26 @@
+from .instrumentation import server_timing
+
+
+class ServerTimingMiddleware:
+    """
+    Adds the parse timings of the nested parsers to the `Server-Timing`
+    header of the response, the parsers only record them when
+    `SERVER_TIMING` is on
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        stats = getattr(request, 'nested_form_stats', None)
+
+        if stats is not None:
+            timing = server_timing(stats)
+
+            if response.has_header('Server-Timing'):
+                timing = '%s, %s' % (response['Server-Timing'], timing)
+
+            response['Server-Timing'] = timing
+
+        return response
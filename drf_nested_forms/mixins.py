@@ -3,6 +3,9 @@ Mixin class
 """
 import re
 
+from .coercers import default_table
+from .tokenizer import is_dict_step, is_nested_key
+
 # Nested Form data deserializer utility class
 # --------------------------------------------
 
@@ -10,11 +13,9 @@ class UtilityMixin:
     """
     A utility class containing neeeded functions
     """
-    _nested_re = re.compile(r'((.+)(\[(.*)\])+)|(\[(.*)\])+')
     _namespace_re = re.compile(r'^([\w]+)(?=\[)')
     _list_re = re.compile(r'\[[0-9]+\]')
     _number_re = re.compile(r'[0-9]+')
-    _dict_re = re.compile(r'\[(([^A-Za-z]*)([^0-9]+)([0-9]*))+\]')
 
     @staticmethod
     def strip_bracket(string=''):
@@ -32,8 +33,9 @@ class UtilityMixin:
     def str_is_empty_dict(string=''):
         return string == '{}'
 
-    def str_is_dict(self, string=''):
-        return bool(self._dict_re.fullmatch(string))
+    @staticmethod
+    def str_is_dict(string=''):
+        return is_dict_step(string)
 
     def str_is_list(self, string=''):
         return bool(self._list_re.fullmatch(string))
@@ -41,8 +43,9 @@ class UtilityMixin:
     def str_is_number(self, string=''):
         return bool(self._number_re.fullmatch(string))
 
-    def str_is_nested(self, string=''):
-        return bool(self._nested_re.fullmatch(string))
+    @staticmethod
+    def str_is_nested(string=''):
+        return is_nested_key(string)
 
     def str_is_namespaced(self, string=''):
         return bool(self._namespace_re.match(string))
@@ -83,25 +86,7 @@ class UtilityMixin:
         Replaces special characters like null, booleans
         also changes numbers from string to integer
         """
-
-        # we have no interest in any value that is not a string
-        if not isinstance(string, str):
-            return string
-
-        if string == 'null':
-            return None
-        elif string == 'true':
-            return True
-        elif string == 'false':
-            return False
-        elif self.str_is_number(string):
-            return int(string)
-        elif self.str_is_empty_list(string):
-            return []
-        elif self.str_is_empty_dict(string):
-            return {}
-        else:
-            return string
+        return default_table.coerce(string)
 
     def get_key(self, nested_key, position=0):
         """
@@ -1,46 +1,543 @@
-from rest_framework.parsers import MultiPartParser, JSONParser
+import time
+from importlib import import_module
+from urllib.parse import unquote_to_bytes
 
-from .utils import NestedForm
+from django.conf import settings
+from django.core.exceptions import TooManyFieldsSent
+from django.http import QueryDict
+from django.http.multipartparser import (
+    MultiPartParser as DjangoMultiPartParser,
+    MultiPartParserError
+)
+from django.utils.datastructures import MultiValueDict
+from rest_framework.exceptions import ParseError
+from rest_framework.utils import json
+from rest_framework.parsers import (
+    DataAndFiles, FormParser, MultiPartParser, JSONParser
+)
+
+from .cache import ResultCacheMixin, cache_result
+from .exceptions import ParseError as NestedParseError
+from .instrumentation import ParseStats, measure_tree
+from .plans import PlannedNestedForm
+from .utils import NestedForm, NestedFormBuilder
 from .settings import api_settings
+from .tokenizer import key_cache
+
+
+key_cache.configure(api_settings.KEY_CACHE_SIZE)
+
+
+def get_plan(parser_context):
+    """
+    Return the decode plan declared as `nested_form_plan` on the view
+    """
+    view = (parser_context or {}).get('view')
+
+    return getattr(view, 'nested_form_plan', None)
+
+
+def collect_multi_value_items(*multi_value_dicts):
+    """
+    Collect the multi value dicts into a single dict, a key with many
+    values holds the list of its values
+    """
+    collected = {}
+
+    for multi_value_dict in multi_value_dicts:
+        for key, values in dict.items(multi_value_dict):
+            if key in collected:
+                collected[key] = collected[key] + values
+            else:
+                collected[key] = values
+
+    return {
+        key: values if len(values) > 1 else values[0]
+        for key, values in collected.items()
+    }
+
+
+def iter_multi_value_items(*multi_value_dicts):
+    """
+    Yields every `(key, value)` pair of the multi value dicts, the
+    lists of values are read in place instead of being copied
+    """
+    for multi_value_dict in multi_value_dicts:
+        for key, values in dict.items(multi_value_dict):
+            for value in values:
+                yield key, value
+
+
+def get_json_decoder(paths):
+    """
+    Return the JSON decoder, a callable like `orjson.loads` or the first
+    of the dotted paths to one that can be imported. `None` when none
+    of them can be
+    """
+    if callable(paths):
+        return paths
+    elif isinstance(paths, str):
+        paths = (paths,)
+
+    for path in paths or ():
+        if callable(path):
+            return path
+
+        try:
+            module_path, name = path.rsplit('.', 1)
+            return getattr(import_module(module_path), name)
+        except (ImportError, AttributeError, ValueError):
+            # not installed or not a path to a decoder
+            continue
+
+    return None
+
+
+def may_have_bracketed_key(body):
+    """
+    JSON without a `]`, escaped or not, cannot have a bracketed key
+    """
+    return b']' in body or b'\\u005d' in body or b'\\u005D' in body
+
+
+def split_urlencoded(body):
+    """
+    Return the `(start, equals, end)` offsets of every field of a
+    urlencoded body, `equals` is `end` for a field without a value.
+    Empty fields are skipped like `parse_qsl` does
+    """
+    fields = []
+    start = 0
+    length = len(body)
+
+    while start <= length:
+        end = body.find(b'&', start)
+
+        if end == -1:
+            end = length
+
+        if end > start:
+            equals = body.find(b'=', start, end)
+            fields.append((start, end if equals == -1 else equals, end))
+
+        start = end + 1
+
+    return fields
+
+
+def unquote_urlencoded(body, view, start, end, encoding):
+    """
+    Decode the part of the body between the offsets, it is only
+    percent-decoded when it has an escape
+    """
+    if body.find(b'%', start, end) == -1 and body.find(b'+', start, end) == -1:
+        return str(view[start:end], encoding, 'replace')
+
+    return unquote_to_bytes(
+        bytes(view[start:end]).replace(b'+', b' ')
+    ).decode(encoding, 'replace')
+
+
+def has_bracketed_key(body, fields):
+    """
+    Check the keys in the body for a bracket, encoded or not,
+    without decoding them
+    """
+    for start, equals, _ in fields:
+        if body.find(b'[', start, equals) != -1:
+            return True
+        elif body.find(b'%5B', start, equals) != -1:
+            return True
+        elif body.find(b'%5b', start, equals) != -1:
+            return True
+
+    return False
+
+
+def iter_urlencoded_items(body, fields, encoding):
+    """
+    Yield the decoded `(key, value)` pair of every field, the
+    body is sliced through a memoryview so nothing is copied
+    before it is decoded
+    """
+    with memoryview(body) as view:
+        for start, equals, end in fields:
+            key = unquote_urlencoded(body, view, start, equals, encoding)
+
+            if equals == end:
+                yield key, ''
+            else:
+                yield key, unquote_urlencoded(
+                    body, view, equals + 1, end, encoding
+                )
+
+
+def check_field_count(fields):
+    """
+    Keep the number of fields within `DATA_UPLOAD_MAX_NUMBER_FIELDS`
+    like a `QueryDict` does
+    """
+    max_fields = settings.DATA_UPLOAD_MAX_NUMBER_FIELDS
+
+    if max_fields is not None and len(fields) > max_fields:
+        raise TooManyFieldsSent(
+            'The number of GET/POST parameters exceeded '
+            'settings.DATA_UPLOAD_MAX_NUMBER_FIELDS.'
+        )
+
+
+def decode_urlencoded(body, fields, encoding, options, plan=None):
+    """
+    Decode the fields of a urlencoded body into a nested object, a body
+    without a nested key is returned as a `QueryDict`
+    """
+    if not has_bracketed_key(body, fields):
+        return QueryDict(body, encoding=encoding)
+
+    items = list(iter_urlencoded_items(body, fields, encoding))
+    positions = {}
+
+    for position, (key, _) in enumerate(items):
+        positions.setdefault(key, position)
+
+    if len(positions) < len(items):
+        # the values of a repeated key are decoded where the key was
+        # first sent, the same way a `QueryDict` groups them
+        items.sort(key=lambda item: positions[item[0]])
+
+    if plan is not None:
+        data = MultiValueDict()
+
+        for key, value in items:
+            data.appendlist(key, value)
+
+        form = PlannedNestedForm(data, plan, **options)
+
+        if form.is_nested():
+            return form.data
+    else:
+        builder = NestedFormBuilder(**options)
+        builder.feed_items(items)
+        data = builder.close()
+
+        if builder.nested:
+            return data
+
+    return QueryDict(body, encoding=encoding)
 
 
-class NestedMultiPartParser(MultiPartParser):
+class StreamingFields:
+    """
+    Stands in for the `QueryDict` filled by django's multipart parser
+    and feeds every field to the builder as soon as it is read. The flat
+    fields are only kept until the first nested key arrives, in case the
+    form turns out not to be nested at all
+    """
+
+    def __init__(self, builder, flat_data):
+        self.builder = builder
+        self.flat_data = flat_data
+
+    def appendlist(self, key, value):
+        self.builder.feed(key, value)
+
+        if self.flat_data is not None:
+            if self.builder.nested:
+                self.flat_data = None
+            else:
+                self.flat_data.appendlist(key, value)
+
+
+class StreamingMultiPartParser(DjangoMultiPartParser):
+    """
+    Django multipart parser that hands over every field to a nested
+    form builder instead of collecting it. The files are collected like
+    django does, they are decoded after the fields as without streaming
+    """
+
+    def __init__(self, META, input_data, upload_handlers, encoding=None,
+                 builder=None):
+        super().__init__(META, input_data, upload_handlers, encoding)
+        self.fields = StreamingFields(builder, QueryDict(mutable=True))
+
+    # django assigns a fresh `QueryDict` to `_post` when it starts
+    # parsing, it is replaced by the streaming fields
+
+    @property
+    def _post(self):
+        return self.fields
+
+    @_post.setter
+    def _post(self, value):
+        pass
+
+
+class ParseReportMixin:
+    """
+    Reports the timings and the shape of every parse to the parse hook
+    and records them on the request for the `Server-Timing` header
+    """
+    server_timing = api_settings.SERVER_TIMING
+
+    def get_parse_hook(self):
+        return api_settings.PARSE_HOOK
+
+    def report(self, parser_context, data, key_count, base_time,
+               decode_time, fast_path, files=None, cached=False):
+        parse_hook = self.get_parse_hook()
+
+        if parse_hook is None and not self.server_timing:
+            return
+
+        request = (parser_context or {}).get('request')
+
+        if fast_path:
+            node_count = max_depth = 0
+            file_count = measure_tree(
+                [value for _, value in iter_multi_value_items(files or {})]
+            )[2]
+        else:
+            node_count, max_depth, file_count = measure_tree(data)
+
+        stats = ParseStats(
+            type(self).__name__, base_time, decode_time, key_count,
+            max_depth, node_count, file_count, fast_path, cached
+        )
+
+        if self.server_timing and request is not None:
+            getattr(request, '_request', request).nested_form_stats = stats
+
+        if parse_hook is not None:
+            parse_hook(stats, request)
+
+
+class NestedMultiPartParser(ResultCacheMixin, ParseReportMixin,
+                            MultiPartParser):
     """
     Parser for multipart form data that is nested and also
-    it may include files
+    it may include files. A view with a decode plan is never streamed
     """
     options = api_settings.OPTIONS
+    streaming = api_settings.STREAM_MULTIPART
 
+    @cache_result
     def parse(self, stream, media_type=None, parser_context=None):
-        parsed = super().parse(stream, media_type, parser_context)
+        plan = get_plan(parser_context)
+        start = time.perf_counter()
 
-        # files and data have to be merged into one
-        if parsed.files:
-            self._full_data = parsed.data.copy()
-            self._full_data.update(parsed.files)
-        else:
-            self._full_data = parsed.data
+        try:
+            if self.streaming and plan is None:
+                # the decoding overlaps reading the body and is
+                # counted in the base time
+                builder = NestedFormBuilder(**self.options)
+                data = self._stream(stream, media_type, parser_context, builder)
+                decode_start = time.perf_counter()
+                key_count = builder.key_count
+            else:
+                parsed = super().parse(stream, media_type, parser_context)
+                decode_start = time.perf_counter()
+                data = self._decode(parsed, plan)
+                key_count = len(parsed.data) + len(parsed.files or {})
+        except NestedParseError as exc:
+            raise ParseError('Nested form parse error - %s' % str(exc))
 
-        form = NestedForm(self._full_data, **self.options)
+        fast_path = isinstance(data, DataAndFiles)
+
+        if fast_path:
+            key_count = len(data.data) + len(data.files or {})
+
+        self.report(
+            parser_context, data, key_count, decode_start - start,
+            time.perf_counter() - decode_start, fast_path,
+            data.files if fast_path else None
+        )
+
+        return data
+
+    def _decode(self, parsed, plan=None):
+        """
+        Decode the data and files in place, a key sent as data and
+        as a file holds the values of both
+        """
+        multi_value_dicts = (parsed.data, parsed.files or {})
+        parsed_keys = [
+            key_cache.tokenize(key)
+            for multi_value_dict in multi_value_dicts
+            for key in multi_value_dict
+        ]
+
+        if not any(parsed_key.nested for parsed_key in parsed_keys):
+            return parsed
+
+        if plan is not None:
+            form = PlannedNestedForm(
+                collect_multi_value_items(*multi_value_dicts), plan,
+                **self.options
+            )
+            form.is_nested()
 
-        if form.is_nested():
             return form.data
 
-        return parsed
+        builder = NestedFormBuilder(**self.options)
+        builder.check_budgets(parsed_keys)
+        builder.feed_items(iter_multi_value_items(*multi_value_dicts))
 
+        return builder.close()
 
-class NestedJSONParser(JSONParser):
+    def _stream(self, stream, media_type=None, parser_context=None,
+                builder=None):
+        """
+        Build the nested tree while the parts of the form arrive
+        """
+        parser_context = parser_context or {}
+        request = parser_context['request']
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        meta = request.META.copy()
+        meta['CONTENT_TYPE'] = media_type
+        upload_handlers = request.upload_handlers
+        builder = builder or NestedFormBuilder(**self.options)
+
+        try:
+            parser = StreamingMultiPartParser(
+                meta, stream, upload_handlers, encoding, builder
+            )
+            data, files = parser.parse()
+        except MultiPartParserError as exc:
+            raise ParseError('Multipart form parse error - %s' % str(exc))
+
+        if data is not parser.fields:
+            # an empty body or an upload handler that took care of
+            # the whole parsing
+            return self._decode(DataAndFiles(data, files))
+
+        # a list with indices split between fields and files is only
+        # placed the same way when the files come after the fields
+        builder.feed_items(iter_multi_value_items(files))
+
+        if builder.nested:
+            return builder.close()
+
+        data = parser.fields.flat_data
+        data._mutable = False
+
+        return DataAndFiles(data, files)
+
+
+class NestedJSONParser(ResultCacheMixin, ParseReportMixin, JSONParser):
     """
     Parser for JSON data that is nested
     """
     options = api_settings.OPTIONS
+    nested_check = api_settings.JSON_NESTED_CHECK
+
+    # a plain python function would be bound as a method
+    json_decoder = staticmethod(get_json_decoder(api_settings.JSON_DECODER))
 
+    @cache_result
     def parse(self, stream, media_type=None, parser_context=None):
-        parsed = super().parse(stream, media_type, parser_context)
+        start = time.perf_counter()
+        parsed, bracketed = self.load(stream, parser_context)
+        decode_start = time.perf_counter()
+        data = self._decode(parsed, parser_context) if bracketed else parsed
+        key_count = len(parsed) if isinstance(parsed, dict) else 0
 
-        form = NestedForm(parsed, **self.options)
+        self.report(
+            parser_context, data, key_count, decode_start - start,
+            time.perf_counter() - decode_start, data is parsed
+        )
 
-        if form.is_nested():
-            return form.data
+        return data
+
+    def load(self, stream, parser_context=None):
+        """
+        Decode the JSON body with `json_decoder` or the `json` module,
+        returns the object and whether it may have a bracketed key
+        """
+        encoding = (parser_context or {}).get(
+            'encoding', settings.DEFAULT_CHARSET
+        )
+        body = stream.read()
+
+        try:
+            if encoding.lower().replace('-', '') != 'utf8':
+                body = body.decode(encoding).encode('utf-8')
+
+            if self.json_decoder is not None:
+                parsed = self.json_decoder(body)
+            else:
+                parse_constant = json.strict_constant if self.strict else None
+                parsed = json.loads(body, parse_constant=parse_constant)
+        except ValueError as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
+
+        return parsed, may_have_bracketed_key(body)
+
+    def _decode(self, parsed, parser_context=None):
+        # plain JSON is returned as it is without creating a form
+        if not self.may_be_nested(parsed):
+            return parsed
+
+        plan = get_plan(parser_context)
+
+        if plan is not None:
+            form = PlannedNestedForm(parsed, plan, **self.options)
+        else:
+            form = NestedForm(parsed, **self.options)
+
+        try:
+            if form.is_nested():
+                return form.data
+        except NestedParseError as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
 
         return parsed
+
+    def may_be_nested(self, parsed):
+        """
+        Cheap check that rejects JSON without a bracketed key, only the
+        first key is checked when `nested_check` is `'first'`
+        """
+        if not isinstance(parsed, dict) or not parsed:
+            return False
+
+        if self.nested_check == 'first':
+            keys = (next(iter(parsed)),)
+        else:
+            keys = parsed
+
+        return any(key.endswith(']') for key in keys)
+
+
+class NestedFormParser(ResultCacheMixin, ParseReportMixin, FormParser):
+    """
+    Parser for urlencoded form data that is nested, the body is decoded
+    straight into the nested object without building a `QueryDict`.
+    A form without a bracketed key is returned as a `QueryDict`
+    """
+    options = api_settings.OPTIONS
+
+    @cache_result
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        start = time.perf_counter()
+        body = stream.read() if stream is not None else b''
+        fields = split_urlencoded(body)
+        check_field_count(fields)
+
+        decode_start = time.perf_counter()
+
+        try:
+            data = self._decode(body, fields, encoding, get_plan(parser_context))
+        except NestedParseError as exc:
+            raise ParseError('Nested form parse error - %s' % str(exc))
+
+        self.report(
+            parser_context, data, len(fields), decode_start - start,
+            time.perf_counter() - decode_start, isinstance(data, QueryDict)
+        )
+
+        return data
+
+    def _decode(self, body, fields, encoding, plan=None):
+        return decode_urlencoded(body, fields, encoding, self.options, plan)
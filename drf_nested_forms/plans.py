@@ -0,0 +1,253 @@
+"""
+Decode plans compiled from serializers, a form of a known shape is
+decoded by looking its keys up in the plan instead of inferring the
+structure from the keys
+"""
+from collections import namedtuple
+
+from rest_framework.fields import ListField
+from rest_framework.relations import ManyRelatedField
+from rest_framework.serializers import BaseSerializer, ListSerializer
+
+from .tokenizer import (
+    APPEND, DICT, LIST, MAX_CACHED_KEY_LENGTH, NON_NESTED, Token
+)
+from .utils import NestedForm
+
+
+# Kinds of plan nodes, a `value` node holds anything that is not
+# decoded any further
+# ----------------------------------------------------------------
+
+VALUE = 'value'
+
+PlanNode = namedtuple('PlanNode', [
+    'kind',         # `dict`, `list` or `value`
+    'children',     # the child node of every field of a `dict` node or
+                    # the node of the items of a `list` node
+])
+
+# number of resolved keys kept by a plan, keys with list indices
+# beyond it are resolved on every request
+DEFAULT_MAX_PATHS = 4096
+
+
+class PlanMismatch(Exception):
+    """
+    The form does not have the shape of the plan
+    """
+    pass
+
+
+def compile_field(field):
+    """
+    Compile the plan node of a serializer field
+    """
+    if isinstance(field, ListSerializer):
+        return PlanNode(LIST, compile_field(field.child))
+    elif isinstance(field, BaseSerializer):
+        return PlanNode(DICT, {
+            name: compile_field(child) for name, child in field.fields.items()
+        })
+    elif isinstance(field, ListField):
+        return PlanNode(LIST, compile_field(field.child))
+    elif isinstance(field, ManyRelatedField):
+        return PlanNode(LIST, PlanNode(VALUE, None))
+
+    return PlanNode(VALUE, None)
+
+
+def compile_plan(serializer):
+    """
+    Compile the decode plan of a serializer class or instance, nested
+    serializers are decoded to dicts while `ListField`, `ListSerializer`
+    and `many=True` fields are decoded to lists
+    """
+    if isinstance(serializer, type):
+        serializer = serializer()
+
+    return DecodePlan(compile_field(serializer))
+
+
+class DecodePlan:
+    """
+    The shape of a form, the path of every key is resolved against
+    the plan once and then looked up
+    """
+
+    def __init__(self, root, max_paths=DEFAULT_MAX_PATHS):
+        self.root = root
+        self.max_paths = max_paths
+        self._paths = {}
+
+    def resolve(self, parsed):
+        """
+        Return the moves of a parsed key as `(index, kind)` pairs, where
+        `kind` is the container created for the next move or `None`
+        for the value. Raises `PlanMismatch` for keys off the plan
+        """
+        try:
+            moves = self._paths[parsed.key]
+        except KeyError:
+            moves = self._resolve(parsed)
+
+            if (
+                len(self._paths) < self.max_paths
+                and len(parsed.key) <= MAX_CACHED_KEY_LENGTH
+            ):
+                self._paths[parsed.key] = moves
+
+        if moves is None:
+            raise PlanMismatch(parsed.key)
+
+        return moves
+
+    def _resolve(self, parsed):
+        root = self.root
+
+        if not parsed.nested:
+            # plain keys are placed at the root as they are
+            if parsed.group != NON_NESTED or root.kind != DICT:
+                return None
+
+            return ((parsed.key, None),)
+
+        steps = parsed.steps
+
+        if parsed.namespace is not None:
+            if parsed.namespace in (DICT, LIST, NON_NESTED):
+                # the group of the namespace is shared with other keys
+                return None
+            elif steps[0].kind == APPEND:
+                # the first `[]` of a namespace is decoded as a dict key
+                return None
+
+            steps = (Token(DICT, parsed.namespace),) + steps
+        elif steps[0].kind != root.kind or root.kind == VALUE:
+            return None
+
+        moves = []
+        node = root
+        last_depth = len(steps) - 1
+
+        for depth, step in enumerate(steps):
+            if node.kind == DICT and step.kind == DICT:
+                child = node.children.get(step.index)
+            elif node.kind == LIST and step.kind == LIST:
+                child = node.children
+            elif node.kind == LIST and step.kind == APPEND and depth == last_depth:
+                child = node.children
+            else:
+                return None
+
+            if child is None:
+                return None
+
+            if depth == last_depth:
+                moves.append((step.index, None))
+            elif child.kind == VALUE:
+                return None
+            else:
+                moves.append((step.index, child.kind))
+
+            node = child
+
+        return tuple(moves)
+
+    def decode(self, form):
+        """
+        Decode the validated data of a form, the tree is the same
+        `NestedForm` would build
+        """
+        groups = {}
+        created = set()
+        root_is_list = self.root.kind == LIST
+
+        for parsed in form._parsed_keys:
+            moves = self.resolve(parsed)
+            value = form._validated_data[parsed.key]
+            value = form._coerce_value(parsed, value)
+            tree = groups.get(parsed.group)
+
+            if tree is None:
+                tree = groups[parsed.group] = [] if root_is_list else {}
+
+            self._place(tree, moves, value, created)
+
+        if root_is_list:
+            return groups.get(LIST, [])
+
+        # the groups are merged in the order they were first seen
+        root_tree = {}
+
+        for tree in groups.values():
+            for key, value in tree.items():
+                if key in root_tree:
+                    raise PlanMismatch(key)
+
+                root_tree[key] = value
+
+        return root_tree
+
+    @staticmethod
+    def _place(tree, moves, value, created):
+        """
+        Follow the moves down the tree creating the containers of the
+        plan, a value already in the way does not fit the plan
+        """
+        last_depth = len(moves) - 1
+
+        for depth, (index, kind) in enumerate(moves):
+            is_list = type(tree) is list
+
+            if depth == last_depth:
+                if is_list:
+                    if index != len(tree):
+                        raise PlanMismatch(index)
+                    elif value and isinstance(value, list):
+                        tree.extend(value)
+                    else:
+                        tree.append(value)
+                elif index in tree:
+                    raise PlanMismatch(index)
+                else:
+                    tree[index] = value
+
+                return
+
+            if is_list and index == len(tree) or not is_list and index not in tree:
+                inner_tree = {} if kind == DICT else []
+                created.add(id(inner_tree))
+
+                if is_list:
+                    tree.append(inner_tree)
+                else:
+                    tree[index] = inner_tree
+            elif is_list and index > len(tree):
+                raise PlanMismatch(index)
+            else:
+                inner_tree = tree[index]
+
+                if id(inner_tree) not in created:
+                    raise PlanMismatch(index)
+
+            tree = inner_tree
+
+
+class PlannedNestedForm(NestedForm):
+    """
+    Nested form decoded with a plan, a form that does not have the
+    shape of the plan is decoded like any other nested form
+    """
+
+    def __init__(self, data, plan, **kwargs):
+        super().__init__(data, **kwargs)
+        self._plan = plan
+        self.planned = False
+
+    def _process(self):
+        try:
+            self._final_data = self._plan.decode(self)
+            self.planned = True
+        except PlanMismatch:
+            super()._process()
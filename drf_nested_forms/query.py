@@ -0,0 +1,108 @@
+"""
+Nested query params, decoded once per request and cached across
+requests by their raw query string
+"""
+from django.conf import settings
+from django.core.handlers.wsgi import get_bytes_from_wsgi
+from rest_framework.exceptions import ParseError
+
+from .exceptions import ParseError as NestedParseError
+from .helpers import LRUCache, copy_data
+from .parsers import check_field_count, decode_urlencoded, split_urlencoded
+from .settings import api_settings
+
+
+def decode_query_string(query_string, encoding):
+    """
+    Decode a raw query string into a nested object, a query string
+    without a nested key is returned as a `QueryDict`
+    """
+    fields = split_urlencoded(query_string)
+    check_field_count(fields)
+
+    try:
+        return decode_urlencoded(
+            query_string, fields, encoding, api_settings.OPTIONS
+        )
+    except NestedParseError as exc:
+        raise ParseError('Nested query params parse error - %s' % str(exc))
+
+
+# Process wide cache of decoded query strings
+# --------------------------------------------
+
+class QueryCache(LRUCache):
+    """
+    A bounded least recently used cache of decoded query strings
+    shared across requests, every hit returns a copy of the object
+    so it can be changed by the caller
+    """
+
+    def __init__(self, maxsize=None):
+        super().__init__(decode_query_string, maxsize)
+
+    def decode(self, query_string, encoding):
+        data = self._cached(query_string, encoding)
+
+        if self.maxsize:
+            return copy_data(data)
+
+        return data
+
+
+query_cache = QueryCache(api_settings.QUERY_CACHE_SIZE)
+
+
+def get_raw_query_string(request):
+    """
+    Return the query string of a django request as the bytes that were
+    sent, the same way django reads it for `request.GET`
+    """
+    scope = getattr(request, 'scope', None)
+
+    if scope is not None:
+        # an ASGI request has the raw bytes in its scope
+        query_string = scope.get('query_string', b'')
+    elif getattr(request, 'environ', None) is not None:
+        query_string = get_bytes_from_wsgi(request.environ, 'QUERY_STRING', '')
+    else:
+        query_string = request.META.get('QUERY_STRING', '')
+
+    if isinstance(query_string, str):
+        query_string = query_string.encode('utf-8')
+
+    return query_string
+
+
+def get_nested_query_params(request):
+    """
+    Return the query params of a django or DRF request as a nested
+    object, it is decoded the first time it is asked for and the same
+    object is returned for the rest of the request
+    """
+    request = getattr(request, '_request', request)
+
+    try:
+        return request._nested_query_params
+    except AttributeError:
+        pass
+
+    query_string = get_raw_query_string(request)
+    encoding = request.encoding or settings.DEFAULT_CHARSET
+    data = request._nested_query_params = query_cache.decode(
+        query_string, encoding
+    )
+
+    return data
+
+
+class NestedQueryParamsMixin:
+    """
+    Adds `nested_query_params` to a view, the filter backends,
+    paginator and serializers of the view share the decoded object
+    through the request
+    """
+
+    @property
+    def nested_query_params(self):
+        return get_nested_query_params(self.request)
@@ -1,14 +1,47 @@
 from django.conf import settings
 from rest_framework.settings import APISettings
 
+from .tokenizer import DEFAULT_KEY_CACHE_SIZE
 
-USER_SETTINGS = getattr(settings, 'NESTED_FORM_PARSER', {})
 
 DEFAULTS = {
     'OPTIONS': {
         'allow_empty': False,
         'allow_blank': True
-    }
+    },
+    'KEY_CACHE_SIZE': DEFAULT_KEY_CACHE_SIZE,
+    'STREAM_MULTIPART': False,
+    'JSON_NESTED_CHECK': 'all',
+    'JSON_DECODER': None,
+    'PARSE_HOOK': None,
+    'SERVER_TIMING': False,
+    'ASYNC_EXECUTOR': None,
+    'ASYNC_EXECUTOR_THRESHOLD': 256 * 1024,
+    'QUERY_CACHE_SIZE': 256,
+    'RESULT_CACHE': None,
+    'RESULT_CACHE_SIZE': 128,
+    'RESULT_CACHE_TIMEOUT': 10,
+    'RESULT_CACHE_MAX_BODY': 1024 * 1024
 }
 
-api_settings = APISettings(USER_SETTINGS, DEFAULTS)
+IMPORT_STRINGS = (
+    'PARSE_HOOK',
+)
+
+
+
+class NestedFormSettings(APISettings):
+    """
+    `NESTED_FORM_PARSER` is read from the django settings the first
+    time a setting is accessed, not when this module is imported
+    """
+
+    @property
+    def user_settings(self):
+        if not hasattr(self, '_user_settings'):
+            self._user_settings = getattr(settings, 'NESTED_FORM_PARSER', {})
+
+        return self._user_settings
+
+
+api_settings = NestedFormSettings(None, DEFAULTS, IMPORT_STRINGS)
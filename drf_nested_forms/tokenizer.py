@@ -0,0 +1,155 @@
+"""
+Key tokenizer for nested form keys
+"""
+import re
+from collections import namedtuple
+
+from .helpers import LRUCache
+
+
+# Token kinds of a nested key step
+# ---------------------------------
+
+DICT = 'dict'
+LIST = 'list'
+APPEND = 'append'
+OTHER = 'other'
+
+# group of keys that are neither namespaced nor start with a `dict`
+# or `list` step
+NON_NESTED = 'non_nested'
+
+Token = namedtuple('Token', ['kind', 'index'])
+
+ParsedKey = namedtuple('ParsedKey', [
+    'key',          # the original key
+    'namespace',    # leading `\w+` before the first bracket or `None`
+    'stripped',     # the key without its namespace
+    'nested',       # whether the key is a nested key
+    'steps',        # tuple of `Token` for every bracketed step
+    'group',        # the namespace or the type of the first step
+])
+
+# default number of parsed keys kept in the process wide cache
+DEFAULT_KEY_CACHE_SIZE = 4096
+
+# longest key kept in the process wide caches, longer keys are parsed
+# every time so a client cannot pin large keys in memory
+MAX_CACHED_KEY_LENGTH = 256
+
+_word_re = re.compile(r'\w+')
+_number_re = re.compile(r'[0-9]+')
+
+
+def is_nested_key(key):
+    """
+    Check if a key ends with a bracketed step e.g `item[0]` or `[a]`,
+    a key with a line break is never nested. Runs in linear time
+    unlike a regular expression with nested quantifiers
+    """
+    return (
+        key[-1:] == ']'
+        and -1 < key.find('[') < len(key) - 1
+        and '\n' not in key
+    )
+
+
+def is_dict_step(step):
+    """
+    Check if a bracketed step is a `dict` key, anything but ascii
+    digits between the brackets e.g `[name]` or `[-1]`
+    """
+    if len(step) < 3 or step[0] != '[' or step[-1] != ']':
+        return False
+
+    inner = step[1:-1]
+
+    return not (inner.isdigit() and inner.isascii())
+
+
+def tokenize_step(piece):
+    """
+    Classify a single step of a nested key, `piece` is the step
+    without its closing bracket e.g `[attribute` or `[0`
+    """
+    if piece[0] == '[':
+        inner = piece[1:]
+
+        if not inner:
+            # an empty list always has it index as '0'
+            return Token(APPEND, 0)
+        elif inner.isdigit() and inner.isascii():
+            return Token(LIST, int(inner))
+
+        return Token(DICT, inner.replace('[', ''))
+
+    number = _number_re.search(piece)
+
+    return Token(OTHER, int(number.group(0)) if number else None)
+
+
+def tokenize_key(key):
+    """
+    Walk a key once and return its namespace, nested state and
+    typed steps e.g `item[attribute][0][]` gives the namespace `item`
+    and the steps `dict`, `list` and `append`
+    """
+    namespace = None
+    stripped = key
+    bracket = key.find('[')
+
+    if bracket > 0 and _word_re.fullmatch(key, 0, bracket):
+        namespace = key[:bracket]
+        stripped = key[bracket:]
+
+    nested = is_nested_key(key)
+
+    if nested:
+        steps = tuple(
+            tokenize_step(piece)
+            for piece in stripped.split(']') if piece
+        )
+        first_step = steps[0]
+    else:
+        steps = ()
+        first_step = next(
+            (tokenize_step(piece) for piece in stripped.split(']') if piece),
+            None
+        )
+
+    if namespace is not None:
+        group = namespace
+    elif first_step is not None and first_step.kind in (DICT, LIST):
+        group = first_step.kind
+    else:
+        group = NON_NESTED
+
+    return ParsedKey(key, namespace, stripped, nested, steps, group)
+
+
+# Process wide cache of parsed keys
+# ----------------------------------
+
+class KeyCache(LRUCache):
+    """
+    A bounded least recently used cache of parsed keys shared
+    across requests, clients send the same field names on every
+    request so warm keys skip string parsing entirely
+    """
+
+    def __init__(self, maxsize=DEFAULT_KEY_CACHE_SIZE,
+                 max_key_length=MAX_CACHED_KEY_LENGTH):
+        self.max_key_length = max_key_length
+        super().__init__(tokenize_key, maxsize)
+
+    def tokenize(self, key):
+        """
+        Parse a key, keys longer than `max_key_length` are not cached
+        """
+        if len(key) > self.max_key_length:
+            return tokenize_key(key)
+
+        return self._cached(key)
+
+
+key_cache = KeyCache()
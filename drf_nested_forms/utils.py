@@ -2,11 +2,66 @@
 Utilty class for the nested forms and a base class
 for extension
 """
+import itertools
 from collections.abc import Mapping
+from functools import partial
 
+from .coercers import coerce_path, default_table, key_path
 from .exceptions import ParseError
 from .mixins import UtilityMixin
-from .helpers import is_dict, is_list
+from .helpers import is_dict, is_list, short_key
+from .tokenizer import DICT, LIST, key_cache
+
+
+# How a value was placed in the tree, a repeated key replaces the
+# placed value, spreads its values from the index or inserts them
+PLACED = 'placed'
+SPREAD = 'spread'
+PENDING = 'pending'
+
+# Sparse list modes, a list with a gap becomes a mapping of its indices
+# to values or a list of only the values that were sent
+SPARSE_DICT = 'dict'
+SPARSE_COMPACT = 'compact'
+
+# most empty slots filled in a list for a single index
+MAX_GAP = 1000
+
+
+# Read only view of a multi value dict
+# ------------------------------------
+
+class MultiValueMapping(Mapping):
+    """
+    Mapping over a `MultiValueDict` like object that reads the values
+    of a key when it is looked up, a key with a single value gives the
+    value and a repeated key a list of its values
+    """
+    __slots__ = ('_data', '_getlist')
+
+    def __init__(self, data):
+        self._data = data
+
+        if isinstance(data, dict):
+            # a `MultiValueDict` holds the values of every key in a
+            # list, it is read in place instead of being copied
+            self._getlist = partial(dict.__getitem__, data)
+        else:
+            self._getlist = data.getlist
+
+    def __getitem__(self, key):
+        values = self._getlist(key)
+
+        if len(values) == 1:
+            return values[0]
+
+        return list(values)
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __len__(self):
+        return len(self._data)
 
 
 # Base class for converting nested form data to objects
@@ -21,6 +76,34 @@ class NestedFormBaseClass(UtilityMixin):
         self._initial_data = self.__setdata__(data)
         self._allow_empty = kwargs.get('allow_empty', False)
         self._allow_blank = kwargs.get('allow_blank', True)
+        self._lazy = kwargs.get('lazy', False)
+        self._sparse_lists = kwargs.get('sparse_lists', None)
+        self._max_placeholders = kwargs.get('max_placeholders', None)
+        self._placeholders = 0
+        self._sparse_nodes = []
+        self._max_keys = kwargs.get('max_keys', None)
+        self._max_depth = kwargs.get('max_depth', None)
+        self._max_list_index = kwargs.get('max_list_index', None)
+        self._max_nodes = kwargs.get('max_nodes', None)
+        self._nodes = {}
+        self._coercion_table = kwargs.get('coercion_table', default_table)
+        self._coercers = kwargs.get('coercers', None)
+
+        if kwargs.get('max_digits') is not None:
+            self._coercion_table = self._coercion_table.copy(
+                max_digits=kwargs['max_digits']
+            )
+
+        self._budgeted = any(
+            budget is not None for budget in (
+                self._max_keys, self._max_depth,
+                self._max_list_index, self._max_nodes
+            )
+        )
+
+        if self._sparse_lists not in (None, SPARSE_DICT, SPARSE_COMPACT):
+            msg = '`sparse_lists` must be `None`, `%s` or `%s`'
+            raise ValueError(msg % (SPARSE_DICT, SPARSE_COMPACT))
 
     def __run__(self):
         if not hasattr(self, '_final_data'):
@@ -28,19 +111,11 @@ class NestedFormBaseClass(UtilityMixin):
 
     def __setdata__(self, data):
         """
-        Check if data is a MultiValueDIct and 
-        convert it to a dict object else return data
+        Check if data is a MultiValueDIct and wrap it
+        in a mapping of its values else return data
         """
         if hasattr(data, 'getlist'):
-            _data = {}
-
-            for key, value in dict(data).items():
-                if len(value) > 1:
-                    _data.setdefault(key, value)
-                else:
-                    _data.setdefault(key, value[0])
-
-            return _data
+            return MultiValueMapping(data)
 
         return data
               
@@ -71,6 +146,99 @@ class NestedFormBaseClass(UtilityMixin):
 
         return value
 
+    def _coerce_value(self, parsed, value):
+        """
+        Coerce and clean the value of a parsed key in one go, a per path
+        coercer of the key takes the place of the coercion table
+        """
+        if self._coercers:
+            coercer = self._coercers.get(key_path(parsed))
+
+            if coercer is not None:
+                if is_list(value):
+                    # every value of a repeated key is coerced
+                    value = [
+                        coerce_path(coercer, parsed, item) for item in value
+                    ]
+                else:
+                    value = coerce_path(coercer, parsed, value)
+
+                return self._clean_value(value)
+
+        return self._clean_value(self._coercion_table.coerce(value))
+
+    def _coerce_repeated(self, parsed, value):
+        """
+        Coerce a value of a repeated key the way it is placed in the list
+        of values of the key, only a per path coercer applies
+        """
+        if self._coercers:
+            coercer = self._coercers.get(key_path(parsed))
+
+            if coercer is not None:
+                return coerce_path(coercer, parsed, value)
+
+        return value
+
+    def _check_budgets(self, parsed_keys):
+        """
+        Cheap pre-scan of the parsed keys that raises `ParseError` when
+        the form goes over a decode budget, before any tree is built
+        """
+        if not self._budgeted:
+            return
+
+        self._check_key_count(len(parsed_keys))
+
+        for parsed in parsed_keys:
+            self._check_key(parsed)
+
+    def _check_key_count(self, count):
+        if self._max_keys is not None and count > self._max_keys:
+            raise ParseError('too many keys !')
+
+    def _check_key(self, parsed):
+        """
+        Check the depth and list indices of a key, the tree nodes are
+        counted from the distinct paths of the keys
+        """
+        steps = parsed.steps
+
+        if self._max_depth is not None and len(steps) > self._max_depth:
+            raise ParseError(
+                'key `%s` is nested too deeply !' % short_key(parsed.key)
+            )
+
+        if self._max_list_index is not None:
+            for step in steps:
+                if step.kind == LIST and step.index > self._max_list_index:
+                    raise ParseError(
+                        'list index of key `%s` is too large !'
+                        % short_key(parsed.key)
+                    )
+
+        if self._max_nodes is not None:
+            self._count_nodes(parsed)
+
+    def _count_nodes(self, parsed):
+        """
+        Number every node on the path of the key by its parent node
+        and step, a new node is counted as soon as it is seen
+        """
+        nodes = self._nodes
+        node = (parsed.group,)
+
+        for step in parsed.steps:
+            child = nodes.get((node, step))
+
+            if child is None:
+                child = nodes[(node, step)] = len(nodes)
+
+                if len(nodes) > self._max_nodes:
+                    raise ParseError('too many nodes in the tree !')
+
+            node = child
+
     def is_nested(self, raise_exception=False):
         """
         Checks if the initial data map is a nested object
@@ -98,10 +266,14 @@ class NestedFormBaseClass(UtilityMixin):
             return False
         #############################################################
 
-        matched_keys = [
-            self.str_is_nested(key)
+        if self._max_keys is not None:
+            self._check_key_count(len(self._initial_data))
+
+        self._parsed_keys = [
+            key_cache.tokenize(key)
             for key in self._initial_data.keys()
         ]
+        matched_keys = [parsed.nested for parsed in self._parsed_keys]
 
         conditions += [any(matched_keys)]
 
@@ -111,12 +283,136 @@ class NestedFormBaseClass(UtilityMixin):
         #############################################################
 
         if all(conditions):
+            self._check_budgets(self._parsed_keys)
             self._validated_data = self._initial_data
             self.__run__()
 
         return all(conditions)
 
 
+# Lazily decoded trees
+# ---------------------
+
+class PendingTree:
+    """
+    The fields of a namespace that are decoded the first time
+    the namespace is read
+    """
+    __slots__ = ('form', 'nested_data', 'repeated')
+
+    def __init__(self, form, nested_data=None):
+        self.form = form
+        self.nested_data = {} if nested_data is None else nested_data
+        self.repeated = set()
+
+    def add(self, parsed, value):
+        """
+        Add a field, a repeated key holds the list of all its values
+        """
+        entry = self.nested_data.get(parsed.stripped)
+
+        if entry is None:
+            self.nested_data[parsed.stripped] = (parsed, value)
+        elif entry[0].key == parsed.key:
+            if parsed.stripped in self.repeated:
+                entry[1].append(value)
+            else:
+                self.repeated.add(parsed.stripped)
+                self.nested_data[parsed.stripped] = (parsed, [entry[1], value])
+
+    def build(self):
+        return self.form._decode(self.nested_data)
+
+
+class LazyTree(dict):
+    """
+    Root tree whose namespaces are decoded the first time they are
+    read, otherwise it behaves like a plain `dict`
+    """
+
+    def _build(self, key, value):
+        if type(value) is PendingTree:
+            value = value.build()
+            dict.__setitem__(self, key, value)
+
+        return value
+
+    def _build_all(self):
+        for key, value in dict.items(self):
+            if type(value) is PendingTree:
+                dict.__setitem__(self, key, value.build())
+
+    def __getitem__(self, key):
+        return self._build(key, dict.__getitem__(self, key))
+
+    def __iter__(self):
+        # overriding `__iter__` stops `dict(tree)` and `{**tree}`
+        # from copying the pending namespaces
+        return dict.__iter__(self)
+
+    def __eq__(self, other):
+        self._build_all()
+
+        if isinstance(other, LazyTree):
+            other._build_all()
+
+        return dict.__eq__(self, other)
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __repr__(self):
+        self._build_all()
+        return dict.__repr__(self)
+
+    def __or__(self, other):
+        self._build_all()
+        return dict.__or__(self, other)
+
+    def __ror__(self, other):
+        self._build_all()
+        return dict.__ror__(self, other)
+
+    def __reduce__(self):
+        return (dict, (self.copy(),))
+
+    __hash__ = None
+
+    def get(self, key, default=None):
+        if key in self:
+            return self[key]
+
+        return default
+
+    def setdefault(self, key, default=None):
+        if key in self:
+            return self[key]
+
+        return dict.setdefault(self, key, default)
+
+    def pop(self, key, *args):
+        if key in self:
+            self[key]
+
+        return dict.pop(self, key, *args)
+
+    def popitem(self):
+        self._build_all()
+        return dict.popitem(self)
+
+    def copy(self):
+        self._build_all()
+        return dict(dict.items(self))
+
+    def items(self):
+        self._build_all()
+        return dict.items(self)
+
+    def values(self):
+        self._build_all()
+        return dict.values(self)
+
+
 # converts a nested form data to object
 # ---------------------------------------
 
@@ -135,161 +431,534 @@ class NestedForm(NestedFormBaseClass):
     def _grouped_nested_data(self, validated_data):
         """
         Groups nested data based on their type example `namespaced` `list`
-        `dict` and `non-nested`
+        `dict` and `non-nested`, the keys are bucketed in a single pass
+        keeping the order in which the groups are first seen
         """
-        group, nested_keys = [], list(validated_data.keys())
-
-        def get_key(key):
-            if self.str_is_namespaced(key):
-                return self.get_namespace(key)
-
-            return self.EMPTY_KEY
+        group, buckets = [], {}
 
-        while nested_keys:
-            first_key = nested_keys[0]
-            other_keys = []
-            temporary_map = {}
+        for parsed in self._parsed_keys:
+            temporary_map = buckets.get(parsed.group)
 
-            for key in nested_keys:
-                if self.type_of(key) == self.type_of(first_key):
-                    value = validated_data[key]
-                    key = self.strip_namespace(key)
+            if temporary_map is None:
+                temporary_map = buckets[parsed.group] = {}
+                group.append({parsed.namespace or self.EMPTY_KEY: temporary_map})
 
-                    temporary_map.setdefault(key, value)
-                else:
-                    other_keys.append(key)
+            value = validated_data[parsed.key]
 
-            group.append({get_key(first_key): temporary_map})
-            nested_keys = other_keys
+            temporary_map.setdefault(parsed.stripped, (parsed, value))
 
         return group
 
     def _get_root_tree(self, validated_data):
         """
-        Gets the final build
+        Gets the final build, in lazy mode namespaces are only
+        decoded when they are read
         """
         groups = self._grouped_nested_data(validated_data)
-        root_tree = self.get_tree(validated_data.keys())
+        root_tree = self._get_tree(self._parsed_keys)
+
+        if self._lazy and is_dict(root_tree):
+            root_tree = LazyTree()
 
         for group in groups:
             group_key = next(iter(group.keys()))
             group_value = next(iter(group.values()))
 
-            group_tree = self._decode(group_value)
-
-            if is_dict(root_tree):
-                if group_key:
-                    root_tree.setdefault(group_key, group_tree)
-                elif is_dict(group_tree):
-                    root_tree.update(group_tree)
-                else:
-                    root_tree[self.EMPTY_KEY] = group_tree
+            if self._lazy and group_key and self._can_defer(group_value):
+                group_tree = PendingTree(self, group_value)
             else:
-                root_tree.extend(group_tree)
+                group_tree = self._decode(group_value)
+
+            self._merge_group(root_tree, group_key, group_tree)
 
         return root_tree
 
-    def _decode(self, nested_data):
+    def _can_defer(self, nested_data):
         """
-        Trys to convert nested data to an object containing primitives
+        Whether a namespace can be decoded when it is read without
+        raising `ParseError`, by then the parser cannot turn it into a
+        bad request. The values of keys with a per path coercer are
+        coerced to check them
         """
-        tree = self.get_tree(nested_data.keys(), use_first_key=True)
+        if self._max_placeholders is not None:
+            # the placeholders are counted over the whole form
+            return False
+
+        largest_index = value_count = 0
+
+        for parsed, value in nested_data.values():
+            value_count += len(value) if is_list(value) else 1
+
+            for step in parsed.steps:
+                if step.kind == LIST and step.index > largest_index:
+                    largest_index = step.index
 
-        for key, value in nested_data.items():
-            value = self._clean_value(self.replace_special(value))
+            if self._coercers and key_path(parsed) in self._coercers:
+                self._coerce_value(parsed, value)
 
-            if self.str_is_nested(key):
-                self._build_tree(key, value, tree)
+        # no list can grow past the largest index and the count of the
+        # values, so no gap can be over `MAX_GAP`
+        return largest_index + value_count < MAX_GAP
+
+    def _merge_group(self, root_tree, group_key, group_tree):
+        """
+        Insert the tree of a group into the root tree
+        """
+        if is_dict(root_tree):
+            if group_key:
+                root_tree.setdefault(group_key, group_tree)
+            elif is_dict(group_tree):
+                root_tree.update(group_tree)
             else:
-                # the tree tree is automatically a dict
-                tree.setdefault(key, value)
+                root_tree[self.EMPTY_KEY] = group_tree
+        else:
+            root_tree.extend(group_tree)
+
+    def _get_tree(self, parsed_keys):
+        """
+        It return the appropiate root object `[]`|`{}` based
+        on the parsed keys provided
+        """
+        for parsed in parsed_keys:
+            if self._needs_dict_root(parsed):
+                return {}
 
-        return tree
+        return []
 
-    def _build_tree(self, nested_key, value, tree):
+    @staticmethod
+    def _needs_dict_root(parsed):
         """
-        Build the tree for a nested key and insert value
+        Check if the parsed key can only be held by a `dict` root
         """
-        steps = self.split_nested_str(nested_key)
-        steps_index_keys = []
+        condition = (
+            not parsed.nested,
+            parsed.namespace is not None,
+            parsed.nested and parsed.steps[0].kind == DICT,
+        )
 
-        def get_index_keys(depth):
-            """
-            Get and store all the index keys for the nested key
-            """
-            prev_depth = depth - 1
+        return any(condition)
 
-            if prev_depth >= 0:
-                steps_index_keys.append(self.get_index(steps[prev_depth]))
-                return steps_index_keys
+    @staticmethod
+    def _get_group_tree(parsed):
+        """
+        It return the appropiate group object `[]`|`{}` based on
+        the first parsed key of the group
+        """
+        if parsed.nested and parsed.steps[0].kind == LIST:
+            return []
 
-            return steps_index_keys
+        return {}
 
-        def get_value(depth):
-            """
-            Get the nested sub key value
-            """
-            next_depth = depth + 1
+    def _decode(self, nested_data):
+        """
+        Trys to convert nested data to an object containing primitives
+        """
+        return self._decode_items(nested_data.values())
 
-            if next_depth < len(steps):
-                if self.str_is_dict(steps[next_depth]):
-                    # at this time the value of the dict is unknown
-                    # so `None` is used
-                    return {self.strip_bracket(steps[next_depth]): None}
-                else:
-                    return []
+    def _decode_items(self, items):
+        """
+        Decode the `(parsed, value)` pairs of a group into its tree
+        """
+        items = iter(items)
+        first_item = next(items)
+        first_key = first_item[0]
+        # the tree of a namespace is held in a list so a sparse list at
+        # its root can be swapped, the top level lists are always padded
+        holder = [self._get_group_tree(first_key)]
+        parent = holder if first_key.namespace else None
+
+        for parsed, value in itertools.chain((first_item,), items):
+            value = self._coerce_value(parsed, value)
+
+            if parsed.nested:
+                self._build_tree(parsed.steps, value, holder[0], parent, 0)
+            else:
+                # the tree tree is automatically a dict
+                holder[0].setdefault(parsed.stripped, value)
 
-            return value
+        if self._sparse_nodes:
+            self._compact_sparse_lists()
+
+        return holder[0]
+
+    def _build_tree(self, steps, value, tree, parent=None, parent_index=None):
+        """
+        Build the tree for the steps of a nested key and insert value,
+        the whole path is inserted in a single descent with a cursor
+        into the tree. Returns where the value was placed as
+        `[tree, index, how]` or `None` if it was merged. `parent` holds
+        `tree` at `parent_index` and is only needed for sparse lists
+        """
+        last_depth = len(steps) - 1
+        slot = None
 
         for depth, step in enumerate(steps):
-            self._build_step_structure(tree, {
-                'depth': depth,
-                'index': self.get_index(step),
-                'value': get_value(depth),
-                'keys': get_index_keys(depth)
-            })
-
-    def _build_step_structure(self, tree, context, depth=0):
-        """
-        Insert and updates the tree according to the context passed as
-        argument
-        """
-        ############################################################################
-        def create_tree(tree, context):
-            if is_list(tree):
-                index = abs(len(tree) - context['index'])
-
-                if index > 1000:
-                    raise ParseError('too many consecutive empty arrays !')
-                elif index > 1 and index <= 1000:
-                    # if it is sparse fill gaps with the `None`
-                    # followed by the default value
-                    tree += [None] * index
-                    tree.append(context['value'])
-                elif context['value'] and is_list(context['value']):
-                    tree.extend(context['value'])
-                else:
-                    tree.append(context['value'])
+            index = step.index
+
+            if depth == last_depth:
+                step_value = value
+            elif steps[depth + 1].kind == DICT:
+                # at this time the value of the dict is unknown
+                # so `None` is used
+                step_value = {steps[depth + 1].index: None}
             else:
-                tree[context['index']] = context['value']
-        ###############################################################################
-
-        while context['depth'] != depth:
-            tree = tree[context['keys'][depth]]
-            depth += 1
+                step_value = []
 
-        try:
-            inner_tree = tree[context['index']]
+            try:
+                inner_tree = tree[index]
+            except (KeyError, IndexError):
+                inner_tree = None
 
             if inner_tree:
-                if is_list(inner_tree) and context['value']:
-                    inner_tree.append(context['value'])
-                elif is_dict(inner_tree) and is_dict(context['value']):
-                    key = next(iter(context['value'].keys()))
+                if is_list(inner_tree) and step_value:
+                    inner_tree.append(step_value)
+                    slot = [inner_tree, len(inner_tree) - 1, PLACED]
+                elif is_list(inner_tree):
+                    slot = [inner_tree, len(inner_tree), PENDING]
+                elif is_dict(inner_tree) and is_dict(step_value) and step_value:
+                    key = next(iter(step_value.keys()))
 
                     if key not in inner_tree:
-                        inner_tree.update(context['value'])
+                        inner_tree.update(step_value)
+            else:
+                if (
+                    self._sparse_lists
+                    and parent is not None
+                    and is_list(tree)
+                    and index - len(tree) > 1
+                ):
+                    tree = self._make_sparse(tree, parent, parent_index, depth)
+
+                slot = self._create_tree(tree, index, step_value)
+
+            if depth != last_depth:
+                parent, parent_index = tree, index
+                tree = tree[index]
+                slot = None
+
+        return slot
+
+    def _make_sparse(self, tree, parent, parent_index, depth):
+        """
+        Replace a list that would need empty placeholders with
+        a mapping of its indices to values
+        """
+        sparse_tree = dict(enumerate(tree))
+        parent[parent_index] = sparse_tree
+
+        if self._sparse_lists == SPARSE_COMPACT:
+            self._sparse_nodes.append((parent, parent_index, sparse_tree, depth))
+
+        return sparse_tree
+
+    def _compact_sparse_lists(self):
+        """
+        Turn the sparse mappings back into lists of their values in
+        the order of the indices, the deepest ones first
+        """
+        sparse_nodes = sorted(
+            self._sparse_nodes, key=lambda node: node[3], reverse=True
+        )
+        self._sparse_nodes = []
+
+        for parent, parent_index, sparse_tree, _ in sparse_nodes:
+            if parent[parent_index] is not sparse_tree:
+                continue
+
+            try:
+                indices = sorted(sparse_tree)
+            except TypeError:
+                # a key that is not a list index keeps the mapping
+                continue
+
+            parent[parent_index] = [sparse_tree[index] for index in indices]
+
+    def _create_tree(self, tree, index, value):
+        """
+        Insert the value at the index of the tree and return where
+        it was placed
+        """
+        if is_list(tree):
+            gap = abs(len(tree) - index)
+
+            if gap > MAX_GAP:
+                raise ParseError('too many consecutive empty arrays !')
+            elif gap > 1:
+                # if it is sparse fill gaps with the `None`
+                # followed by the default value
+                self._count_placeholders(gap)
+                tree += [None] * gap
+                tree.append(value)
+            elif value and is_list(value):
+                tree.extend(value)
+                return None
+            else:
+                tree.append(value)
+                return [tree, len(tree) - 1, SPREAD]
+
+            return [tree, len(tree) - 1, PLACED]
+
+        tree[index] = value
+
+        return [tree, index, PLACED]
+
+    def _count_placeholders(self, count):
+        """
+        Keep the empty placeholders of the whole form within
+        `max_placeholders`
+        """
+        self._placeholders += count
+
+        if (
+            self._max_placeholders is not None
+            and self._placeholders > self._max_placeholders
+        ):
+            raise ParseError('too many empty list placeholders !')
+
+
+# Incrementally converts nested form fields to object
+# -----------------------------------------------------
+
+class NestedFormBuilder(NestedForm):
+    """
+    Decode nested form fields one at a time as they are fed, the
+    fields are never collected into a mapping first. `.close()`
+    returns the same object as `NestedForm.data` for the same fields
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__({}, **kwargs)
+        self.nested = False
+        self._closed = False
+        self._groups = {}
+        self._leaves = {}
+        self._dict_root = False
+        self.key_count = 0
+
+    def feed(self, key, value):
+        """
+        Decode a single field into the tree, feeding the same key again
+        turns its value into a list of all the values fed for it
+        """
+        if self._closed:
+            raise AssertionError('`.feed()` cannot be called after `.close()`')
+
+        parsed = key_cache.tokenize(key)
+        leaf_key = (parsed.group, parsed.stripped)
+
+        if leaf_key in self._leaves:
+            leaf = self._leaves[leaf_key]
+
+            if leaf is not None and leaf[0] == key:
+                self._feed_repeated(leaf, value)
+
+            return
+
+        self.key_count += 1
+
+        if self._budgeted:
+            self._check_key_count(self.key_count)
+            self._check_key(parsed)
+
+        if parsed.nested:
+            self.nested = True
+
+        if not self._dict_root and self._needs_dict_root(parsed):
+            self._dict_root = True
+
+        group = self._groups.get(parsed.group)
+
+        if group is None:
+            if self._lazy and parsed.namespace:
+                tree = PendingTree(self)
             else:
-                create_tree(tree, context)
-        except (KeyError, IndexError):
-            create_tree(tree, context)
+                tree = self._get_group_tree(parsed)
+
+            group = self._groups[parsed.group] = [
+                parsed.namespace or self.EMPTY_KEY, tree
+            ]
+
+        tree = group[1]
+
+        if type(tree) is PendingTree:
+            tree.add(parsed, value)
+            return
+
+        cleaned_value = self._coerce_value(parsed, value)
+
+        if parsed.nested:
+            slot = self._build_tree(
+                parsed.steps, cleaned_value, tree,
+                group if parsed.namespace else None, 1
+            )
+        else:
+            # the tree tree is automatically a dict
+            tree.setdefault(parsed.stripped, cleaned_value)
+            slot = [tree, parsed.stripped, PLACED]
+
+        self._leaves[leaf_key] = slot and [
+            key, slot, [self._coerce_repeated(parsed, value)]
+        ]
+
+    def check_budgets(self, parsed_keys):
+        """
+        Check the decode budgets for all the keys that will be fed up
+        front, the keys are then not checked again as they are fed
+        """
+        self._check_budgets(parsed_keys)
+        self._budgeted = False
+
+    def _feed_repeated(self, leaf, value):
+        """
+        Place a repeated value where a list of all the values of the
+        key would have been placed
+        """
+        key, slot, values = leaf
+        tree, index, how = slot
+        value = self._coerce_repeated(key_cache.tokenize(key), value)
+        values.append(value)
+
+        if how == SPREAD:
+            if len(values) == 2:
+                # the first value was cleaned, a list of values is not
+                tree[index] = values[0]
+
+            tree.insert(index + len(values) - 1, value)
+        elif how == PENDING:
+            tree.insert(index, values)
+            slot[2] = PLACED
+        else:
+            tree[index] = values
+
+    def feed_items(self, items):
+        """
+        Decode every `(key, value)` pair of an iterable
+        """
+        for key, value in items:
+            self.feed(key, value)
+
+    def close(self):
+        """
+        Returns the final build, `.nested` tells if any of the keys fed
+        was a nested key
+        """
+        if self._closed:
+            return self._final_data
+
+        if self._dict_root or not self._groups:
+            root_tree = LazyTree() if self._lazy else {}
+        else:
+            root_tree = []
+
+        self._compact_sparse_lists()
+
+        for group_key, group_tree in self._groups.values():
+            if (
+                type(group_tree) is PendingTree
+                and not self._can_defer(group_tree.nested_data)
+            ):
+                group_tree = group_tree.build()
+
+            self._merge_group(root_tree, group_key, group_tree)
+
+        self._final_data = root_tree
+        self._closed = True
+        self._groups = {}
+        self._leaves = {}
+
+        return root_tree
+
+
+# Converts many nested forms sharing their keys
+# -----------------------------------------------
+
+class NestedFormBatch(NestedForm):
+    """
+    Decode many flat mappings with the same options, the parsed keys,
+    the groups and the root of every set of keys are worked out once
+    and shared by all the mappings with those keys
+    """
+    max_layouts = 256
+
+    def __init__(self, **kwargs):
+        super().__init__({}, **kwargs)
+        # the namespaces are decoded right away
+        self._lazy = False
+        self._layouts = {}
+
+    def decode(self, rows):
+        """
+        Yield the decoded object of every mapping, a mapping without
+        nested keys is yielded as it is
+        """
+        for row in rows:
+            data = self.__setdata__(row)
+            keys = tuple(data)
+
+            try:
+                layout = self._layouts[keys]
+            except KeyError:
+                layout = self._get_layout(data)
+
+                if len(self._layouts) < self.max_layouts:
+                    self._layouts[keys] = layout
+
+            if layout is None:
+                yield row
+                continue
+
+            dict_root, groups = layout
+            root_tree = {} if dict_root else []
+            self._placeholders = 0
+
+            for group_key, group in groups:
+                group_tree = self._decode_items(
+                    (parsed, data[parsed.key]) for parsed in group
+                )
+                self._merge_group(root_tree, group_key, group_tree)
+
+            yield root_tree
+
+    def _get_layout(self, data):
+        """
+        Returns whether the root is a dict and the parsed keys of every
+        group in the order the groups are first seen, or `None` when
+        none of the keys is nested. The budgets are checked here once
+        for all the mappings with the same keys
+        """
+        self._initial_data = data
+        self._nodes = {}
+
+        if not self.is_nested():
+            return None
+
+        groups = {}
+
+        for parsed in self._parsed_keys:
+            group = groups.get(parsed.group)
+
+            if group is None:
+                group = groups[parsed.group] = (
+                    parsed.namespace or self.EMPTY_KEY, {}
+                )
+
+            group[1].setdefault(parsed.stripped, parsed)
+
+        return (
+            is_dict(self._get_tree(self._parsed_keys)),
+            tuple(
+                (group_key, tuple(group.values()))
+                for group_key, group in groups.values()
+            )
+        )
+
+    def _process(self):
+        # the layout is all that is needed from `is_nested()`
+        self._final_data = None
+
+
+def decode_many(rows, **kwargs):
+    """
+    Yield the decoded object of every flat mapping of an iterable
+    """
+    return NestedFormBatch(**kwargs).decode(rows)
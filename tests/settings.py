@@ -19,6 +19,7 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
+    'drf_nested_forms.middleware.ServerTimingMiddleware',
 ]
 
 ROOT_URLCONF = 'tests.urls'
@@ -1,8 +1,29 @@
 from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test.client import BOUNDARY, MULTIPART_CONTENT
 
 from rest_framework.test import APITestCase
 
 
+def encode_fields(fields):
+    """
+    Encode the fields of a multipart body in the given order, a key
+    may be sent more than once
+    """
+    lines = []
+
+    for key, value in fields:
+        lines.extend([
+            '--%s' % BOUNDARY,
+            'Content-Disposition: form-data; name="%s"' % key,
+            '',
+            value,
+        ])
+
+    lines.extend(['--%s--' % BOUNDARY, ''])
+
+    return '\r\n'.join(lines).encode('utf-8')
+
+
 class TestViewTestCase(APITestCase):
 
     def test_multipart_view_nested_dict(self):
@@ -274,3 +295,205 @@ class TestViewTestCase(APITestCase):
         self.assertEqual(response.status_code, 200)
         self.assertEqual(len(response.data), 2)
         self.assertEqual(response.data, expected_output)
+
+    def test_streaming_multipart_view(self):
+
+        data = {
+            'user_address': 1,
+            'products[0][quantity]': 2,
+            'products[0][attributes][0][code]': 'color',
+            'products[0][attributes][0][image]': SimpleUploadedFile('hp.jpeg', b'hp_pic', content_type='image/jpeg'),
+            'products[0][attributes][1][code]': 'size',
+            'products[0][tags][]': ['new', 'sale'],
+            'products[1][quantity]': 'null',
+            'products[1][images][0][image]': SimpleUploadedFile('hp.jpeg', b'hp_pic2', content_type='image/jpeg'),
+            'orderer': 11,
+        }
+
+        response = self.client.post(
+            '/test-multipart-streaming/', data, format='multipart')
+
+        products = response.data['products']
+        expected_output = {
+            'user_address': 1,
+            'products': [
+                {
+                    'quantity': 2,
+                    'attributes': [
+                        {'code': 'color',
+                            'image': products[0]['attributes'][0]['image']},
+                        {'code': 'size'},
+                    ],
+                    'tags': ['new', 'sale'],
+                },
+                {
+                    'quantity': None,
+                    'images': [{'image': products[1]['images'][0]['image']}],
+                },
+            ],
+            'orderer': 11,
+        }
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, expected_output)
+        self.assertEqual(products[0]['attributes'][0]['image'].name, 'hp.jpeg')
+
+    def test_streaming_multipart_view_not_nested(self):
+
+        data = {
+            'user_address': '1',
+            'tags': ['new', 'sale'],
+            'image': SimpleUploadedFile('hp.jpeg', b'hp_pic', content_type='image/jpeg'),
+        }
+
+        response = self.client.post(
+            '/test-multipart-streaming/', data, format='multipart')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data.getlist('tags'), ['new', 'sale'])
+        self.assertEqual(response.data['user_address'], '1')
+        self.assertEqual(response.data['image'].name, 'hp.jpeg')
+
+    def test_streaming_multipart_view_file_order(self):
+
+        for url in ('/test-multipart/', '/test-multipart-streaming/'):
+            data = {
+                'item[gallery][2]': SimpleUploadedFile('hp.jpeg', b'hp_pic', content_type='image/jpeg'),
+                'item[gallery][1]': 'caption',
+            }
+
+            response = self.client.post(url, data, format='multipart')
+
+            gallery = response.data['item']['gallery']
+
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(len(gallery), 2)
+            self.assertEqual(gallery[0], 'caption')
+            self.assertEqual(gallery[1].name, 'hp.jpeg')
+
+    def test_streaming_multipart_view_repeated_key_apart(self):
+
+        body = encode_fields([
+            ('item[0]', 'a'), ('item[1]', 'x'), ('item[0]', 'b'),
+        ])
+        expected_output = {
+            '/test-multipart/': ['a', 'b'],
+            # the values of a key sent apart are placed as they arrive
+            '/test-multipart-streaming/': ['a', 'b', 'x'],
+        }
+
+        for url, items in expected_output.items():
+            response = self.client.post(
+                url, body, content_type=MULTIPART_CONTENT)
+
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.data, {'item': items})
+
+    def test_multipart_view_data_and_file_same_key(self):
+
+        image = SimpleUploadedFile('hp.jpeg', b'hp_pic', content_type='image/jpeg')
+        data = {
+            'item[name]': 'phone',
+            'item[gallery][]': ['caption', image],
+        }
+
+        response = self.client.post('/test-multipart/', data, format='multipart')
+
+        gallery = response.data['item']['gallery']
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['item']['name'], 'phone')
+        self.assertEqual(len(gallery), 2)
+        self.assertEqual(gallery[0], 'caption')
+        self.assertEqual(gallery[1].name, 'hp.jpeg')
+
+    def test_multipart_view_over_budget(self):
+
+        within_budget = {
+            'item[name]': 'phone',
+            'item[gallery][0][caption]': 'front',
+        }
+        too_deep = dict(within_budget, **{'item[gallery][0][size][width]': 3})
+        too_many = {'item[tags][%d]' % index: 'tag' for index in range(6)}
+
+        for url in ('/test-multipart-budget/', '/test-multipart-budget-streaming/'):
+            response = self.client.post(url, within_budget, format='multipart')
+            self.assertEqual(response.status_code, 200)
+
+            for data in (too_deep, too_many):
+                response = self.client.post(url, data, format='multipart')
+                self.assertEqual(response.status_code, 400)
+
+    def test_lazy_multipart_view_parse_error(self):
+
+        valid = {'item[name]': 'phone', 'item[count]': '3'}
+        hostile = (
+            {'item[tags][0]': 'a', 'item[tags][5000]': 'b'},
+            dict(valid, **{'item[count]': 'many'}),
+        )
+
+        for url in ('/test-multipart-lazy/', '/test-multipart-lazy-streaming/'):
+            response = self.client.post(url, valid, format='multipart')
+
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.data, {'item': {'name': 'phone', 'count': 3}})
+
+            for data in hostile:
+                response = self.client.post(url, data, format='multipart')
+
+                self.assertEqual(response.status_code, 400)
+
+    def test_planned_view(self):
+
+        data = {
+            'user_address': 1,
+            'products[0][quantity]': 2,
+            'products[0][attributes][0][code]': 'color',
+            'products[0][attributes][0][image]': SimpleUploadedFile('hp.jpeg', b'hp_pic', content_type='image/jpeg'),
+            'products[0][tags][]': ['new', 'sale'],
+            'products[1][quantity]': 'null',
+        }
+
+        response = self.client.post('/test-planned/', data, format='multipart')
+
+        products = response.data['products']
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['user_address'], 1)
+        self.assertEqual(products[0]['quantity'], 2)
+        self.assertEqual(products[0]['tags'], ['new', 'sale'])
+        self.assertEqual(products[0]['attributes'][0]['code'], 'color')
+        self.assertEqual(products[0]['attributes'][0]['image'].name, 'hp.jpeg')
+        self.assertEqual(products[1], {'quantity': None})
+
+        data = {
+            'user_address': 1,
+            'products[0][attributes][0][code]': 'color',
+            'products[0][attributes][1][code]': 'size',
+        }
+
+        response = self.client.post('/test-planned/', data, format='json')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, {
+            'user_address': 1,
+            'products': [
+                {'attributes': [{'code': 'color'}, {'code': 'size'}]}
+            ],
+        })
+
+    def test_server_timing(self):
+
+        response = self.client.post(
+            '/test-timed/', {'item[name]': 'phone'}, format='multipart')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertRegex(
+            response['Server-Timing'],
+            r'^nested-parse;dur=[0-9.]+, nested-decode;dur=[0-9.]+$'
+        )
+
+        response = self.client.post(
+            '/test-multipart/', {'item[name]': 'phone'}, format='multipart')
+
+        self.assertFalse(response.has_header('Server-Timing'))
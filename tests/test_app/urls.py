@@ -1,8 +1,28 @@
 from django.urls import re_path
-from .views import TestViewMultiPart, TestViewJSON
+from .views import (
+    TestViewMultiPart, TestViewJSON, TestViewStreamingMultiPart,
+    TestViewBudgetMultiPart, TestViewBudgetStreamingMultiPart, TestViewPlanned,
+    TestViewTimed, TestViewLazyMultiPart, TestViewLazyStreamingMultiPart
+)
 
 urlpatterns = [
     re_path(r'^test-multipart/$', TestViewMultiPart.as_view(),
             name='test_multipart'),
-    re_path(r'^test-json/$', TestViewJSON.as_view(), name='test_json')
+    re_path(r'^test-json/$', TestViewJSON.as_view(), name='test_json'),
+    re_path(r'^test-multipart-streaming/$',
+            TestViewStreamingMultiPart.as_view(),
+            name='test_multipart_streaming'),
+    re_path(r'^test-multipart-budget/$', TestViewBudgetMultiPart.as_view(),
+            name='test_multipart_budget'),
+    re_path(r'^test-multipart-budget-streaming/$',
+            TestViewBudgetStreamingMultiPart.as_view(),
+            name='test_multipart_budget_streaming'),
+    re_path(r'^test-multipart-lazy/$', TestViewLazyMultiPart.as_view(),
+            name='test_multipart_lazy'),
+    re_path(r'^test-multipart-lazy-streaming/$',
+            TestViewLazyStreamingMultiPart.as_view(),
+            name='test_multipart_lazy_streaming'),
+    re_path(r'^test-planned/$', TestViewPlanned.as_view(),
+            name='test_planned'),
+    re_path(r'^test-timed/$', TestViewTimed.as_view(), name='test_timed')
 ]
@@ -1,8 +1,53 @@
+from rest_framework import serializers
 from rest_framework.views import APIView
 from rest_framework.parsers import FormParser
 from rest_framework.response import Response
 
 from drf_nested_forms.parsers import NestedMultiPartParser, NestedJSONParser
+from drf_nested_forms.plans import compile_plan
+
+
+class AttributeSerializer(serializers.Serializer):
+    code = serializers.CharField()
+    image = serializers.ImageField(required=False)
+
+
+class ProductSerializer(serializers.Serializer):
+    quantity = serializers.IntegerField(allow_null=True)
+    attributes = AttributeSerializer(many=True)
+    tags = serializers.ListField(child=serializers.CharField())
+
+
+class OrderSerializer(serializers.Serializer):
+    user_address = serializers.IntegerField()
+    products = ProductSerializer(many=True)
+
+
+class NestedStreamingMultiPartParser(NestedMultiPartParser):
+    streaming = True
+
+
+class NestedTimedMultiPartParser(NestedMultiPartParser):
+    server_timing = True
+
+
+class NestedBudgetMultiPartParser(NestedMultiPartParser):
+    options = dict(NestedMultiPartParser.options, max_keys=5, max_depth=3)
+
+
+class NestedBudgetStreamingMultiPartParser(NestedBudgetMultiPartParser):
+    streaming = True
+
+
+class NestedLazyMultiPartParser(NestedMultiPartParser):
+    options = dict(
+        NestedMultiPartParser.options, lazy=True,
+        coercers={'item[count]': int}
+    )
+
+
+class NestedLazyStreamingMultiPartParser(NestedLazyMultiPartParser):
+    streaming = True
 
 
 class TestViewMultiPart(APIView):
@@ -19,3 +64,62 @@ class TestViewJSON(APIView):
     def post(self, request):
 
         return Response(data=request.data, status=200)
+
+
+class TestViewStreamingMultiPart(APIView):
+    parser_classes = (NestedStreamingMultiPartParser, FormParser)
+
+    def post(self, request):
+
+        return Response(data=request.data, status=200)
+
+
+class TestViewBudgetMultiPart(APIView):
+    parser_classes = (NestedBudgetMultiPartParser, FormParser)
+
+    def post(self, request):
+
+        return Response(data=request.data, status=200)
+
+
+class TestViewBudgetStreamingMultiPart(APIView):
+    parser_classes = (NestedBudgetStreamingMultiPartParser, FormParser)
+
+    def post(self, request):
+
+        return Response(data=request.data, status=200)
+
+
+class TestViewLazyMultiPart(APIView):
+    parser_classes = (NestedLazyMultiPartParser, FormParser)
+
+    def post(self, request):
+
+        return Response(data=request.data, status=200)
+
+
+class TestViewLazyStreamingMultiPart(APIView):
+    parser_classes = (NestedLazyStreamingMultiPartParser, FormParser)
+
+    def post(self, request):
+
+        return Response(data=request.data, status=200)
+
+
+class TestViewPlanned(APIView):
+    parser_classes = (
+        NestedStreamingMultiPartParser, NestedJSONParser, FormParser
+    )
+    nested_form_plan = compile_plan(OrderSerializer)
+
+    def post(self, request):
+
+        return Response(data=request.data, status=200)
+
+
+class TestViewTimed(APIView):
+    parser_classes = (NestedTimedMultiPartParser, FormParser)
+
+    def post(self, request):
+
+        return Response(data=request.data, status=200)
@@ -0,0 +1,218 @@
+import asyncio
+import json
+import threading
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.files.uploadhandler import MemoryFileUploadHandler
+from django.test import SimpleTestCase
+from django.test.client import MULTIPART_CONTENT, RequestFactory
+from rest_framework.exceptions import ParseError
+from rest_framework.request import Request
+
+from drf_nested_forms.async_parsers import (
+    AsyncNestedJSONParser, AsyncNestedMultiPartParser, aparse_request
+)
+from drf_nested_forms.cache import ResultCache
+from drf_nested_forms.parsers import NestedJSONParser, NestedMultiPartParser
+
+
+class ThreadRecordingHandler(MemoryFileUploadHandler):
+
+    def handle_raw_input(self, *args, **kwargs):
+        self.thread = threading.current_thread()
+
+        return super().handle_raw_input(*args, **kwargs)
+
+
+class ThreadRecordingJSONParser(AsyncNestedJSONParser):
+
+    @staticmethod
+    def json_decoder(body):
+        ThreadRecordingJSONParser.thread = threading.current_thread()
+
+        return json.loads(body)
+
+
+class CachedMultiPartParser(AsyncNestedMultiPartParser):
+
+    def __init__(self, cache):
+        self.cache = cache
+        self.parses = 0
+        self.hits = 0
+
+    def get_result_cache(self):
+        return self.cache
+
+    def get_parse_hook(self):
+        def hook(stats, request):
+            if stats.cached:
+                self.hits += 1
+            else:
+                self.parses += 1
+
+        return hook
+
+
+class AsyncParserTestCase(SimpleTestCase):
+    form = {
+        'user_address': 1,
+        'products[0][quantity]': 2,
+        'products[0][attributes][0][code]': 'color',
+        'products[0][attributes][1][code]': 'size',
+        'products[0][tags][]': ['new', 'sale'],
+        'products[1][quantity]': 'null',
+        'orderer': 11,
+    }
+
+    def multipart_request(self, data):
+        return RequestFactory().post('/', data, content_type=MULTIPART_CONTENT)
+
+    def json_request(self, data):
+        return RequestFactory().post(
+            '/', json.dumps(data), content_type='application/json'
+        )
+
+    def sync_parse(self, request, parser_class):
+        return Request(request, parsers=[parser_class()]).data
+
+    def async_parse(self, request, parser_class, executor=None):
+        parser = parser_class()
+        parser.executor = executor
+        parser.executor_threshold = 0
+
+        data, files = asyncio.run(aparse_request(request, [parser]))
+
+        return data
+
+    def test_same_as_sync(self):
+        """
+        every executor gives the result of the sync parsers
+        """
+        for executor in (None, 'thread', 'process'):
+            self.assertEqual(
+                self.async_parse(
+                    self.multipart_request(self.form),
+                    AsyncNestedMultiPartParser, executor
+                ),
+                self.sync_parse(
+                    self.multipart_request(self.form), NestedMultiPartParser
+                ),
+                executor
+            )
+            self.assertEqual(
+                self.async_parse(
+                    self.json_request(self.form),
+                    AsyncNestedJSONParser, executor
+                ),
+                self.sync_parse(self.json_request(self.form), NestedJSONParser),
+                executor
+            )
+
+    def test_not_nested(self):
+        data = {'user_address': '1', 'tags': ['new', 'sale']}
+
+        for executor in (None, 'process'):
+            parsed = self.async_parse(
+                self.multipart_request(data), AsyncNestedMultiPartParser,
+                executor
+            )
+
+            self.assertEqual(parsed.getlist('tags'), ['new', 'sale'])
+            self.assertEqual(
+                self.async_parse(
+                    self.json_request(data), AsyncNestedJSONParser, executor
+                ),
+                data
+            )
+
+    def test_files(self):
+        """
+        forms with files are decoded in a thread instead of a process
+        """
+        data = dict(self.form, **{
+            'products[0][attributes][0][image]': SimpleUploadedFile(
+                'hp.jpeg', b'hp_pic', content_type='image/jpeg'
+            ),
+        })
+        parsed = self.async_parse(
+            self.multipart_request(data), AsyncNestedMultiPartParser, 'process'
+        )
+        image = parsed['products'][0]['attributes'][0]['image']
+
+        self.assertEqual(image.name, 'hp.jpeg')
+        self.assertEqual(image.read(), b'hp_pic')
+
+    def test_process_reads_in_thread(self):
+        """
+        the multipart body is read in a thread, the event loop is never
+        blocked by the base parser
+        """
+        handler = ThreadRecordingHandler()
+        request = self.multipart_request(self.form)
+        request.upload_handlers = [handler]
+        self.async_parse(request, AsyncNestedMultiPartParser, 'process')
+
+        self.assertIsNot(handler.thread, threading.main_thread())
+
+    def test_process_loads_in_thread(self):
+        self.async_parse(
+            self.json_request(self.form), ThreadRecordingJSONParser, 'process'
+        )
+
+        self.assertIsNot(
+            ThreadRecordingJSONParser.thread, threading.main_thread()
+        )
+
+    def test_process_streaming(self):
+        parser = AsyncNestedMultiPartParser()
+        parser.executor = 'process'
+        parser.executor_threshold = 0
+        parser.streaming = True
+        data, files = asyncio.run(
+            aparse_request(self.multipart_request(self.form), [parser])
+        )
+
+        self.assertFalse(parser.decodes_in_process({}))
+        self.assertEqual(
+            data,
+            self.sync_parse(
+                self.multipart_request(self.form), NestedMultiPartParser
+            )
+        )
+
+    def test_process_result_cache(self):
+        parser = CachedMultiPartParser(ResultCache(8, 60))
+        parser.executor = 'process'
+        parser.executor_threshold = 0
+
+        for _ in range(2):
+            data, files = asyncio.run(
+                aparse_request(self.multipart_request(self.form), [parser])
+            )
+
+            self.assertEqual(data['products'][0]['tags'], ['new', 'sale'])
+
+        self.assertEqual(parser.parses, 1)
+        self.assertEqual(parser.hits, 1)
+
+    def test_parse_error(self):
+        data = {'tags[5000]': 'a'}
+
+        with self.assertRaises(ParseError) as context:
+            self.sync_parse(self.json_request(data), NestedJSONParser)
+
+        self.assertIn('JSON parse error', str(context.exception))
+
+        for executor in (None, 'thread', 'process'):
+            with self.assertRaisesMessage(ParseError, str(context.exception)):
+                self.async_parse(
+                    self.json_request(data), AsyncNestedJSONParser, executor
+                )
+
+    def test_empty_body(self):
+        request = RequestFactory().post('/', b'', content_type='application/json')
+
+        self.assertEqual(
+            asyncio.run(aparse_request(request, [AsyncNestedJSONParser()]))[0],
+            {}
+        )
@@ -0,0 +1,203 @@
+import json
+from io import BytesIO
+
+from django.core.cache import caches
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import SimpleTestCase
+from django.test.client import MULTIPART_CONTENT, RequestFactory
+from rest_framework.request import Request
+
+from drf_nested_forms.cache import ResultCache, get_digest
+from drf_nested_forms.parsers import NestedJSONParser, NestedMultiPartParser
+
+
+class CountingMixin:
+
+    def __init__(self, cache):
+        self.cache = cache
+        self.parses = 0
+        self.hits = 0
+
+    def get_result_cache(self):
+        return self.cache
+
+    def get_parse_hook(self):
+        def hook(stats, request):
+            if stats.cached:
+                self.hits += 1
+            else:
+                self.parses += 1
+
+        return hook
+
+
+class CountingJSONParser(CountingMixin, NestedJSONParser):
+    pass
+
+
+class CountingMultiPartParser(CountingMixin, NestedMultiPartParser):
+    pass
+
+
+class ResultCacheTestCase(SimpleTestCase):
+    factory = RequestFactory()
+
+    def parse_json(self, parser, data):
+        body = json.dumps(data).encode('utf-8')
+        request = self.factory.post(
+            '/', body, content_type='application/json'
+        )
+
+        return parser.parse(
+            BytesIO(body), 'application/json',
+            {'request': request, 'encoding': 'utf-8'}
+        )
+
+    def parse_multipart(self, parser, data):
+        request = self.factory.post('/', data)
+        body = request.body
+        request = Request(request)
+
+        return parser.parse(
+            BytesIO(body), MULTIPART_CONTENT,
+            {'request': request, 'encoding': 'utf-8'}
+        )
+
+    def test_json(self):
+        parser = CountingJSONParser(ResultCache(8, 60))
+        data = {'item[tags][0]': 'new', 'item[name]': 'shirt'}
+        first = self.parse_json(parser, data)
+        first['item']['tags'].append('sale')
+        second = self.parse_json(parser, data)
+
+        self.assertEqual(second, {'item': {'tags': ['new'], 'name': 'shirt'}})
+        self.assertEqual(parser.parses, 1)
+
+        second['item']['tags'].append('old')
+
+        self.assertEqual(
+            self.parse_json(parser, data)['item']['tags'], ['new']
+        )
+        self.assertEqual(parser.parses, 1)
+        self.assertEqual(parser.hits, 2)
+
+    def test_multipart(self):
+        parser = CountingMultiPartParser(ResultCache(8, 60))
+        data = {'item[tags][0]': 'new', 'item[name]': 'shirt'}
+
+        for _ in range(2):
+            self.assertEqual(
+                self.parse_multipart(parser, data),
+                {'item': {'tags': ['new'], 'name': 'shirt'}}
+            )
+
+        self.assertEqual(parser.parses, 1)
+
+    def test_files_are_not_cached(self):
+        parser = CountingMultiPartParser(ResultCache(8, 60))
+
+        for _ in range(2):
+            data = {
+                'item[name]': 'shirt',
+                'item[image]': SimpleUploadedFile('a.png', b'png'),
+            }
+            parsed = self.parse_multipart(parser, data)
+
+            self.assertEqual(parsed['item']['image'].read(), b'png')
+
+        self.assertEqual(parser.parses, 2)
+        self.assertEqual(parser.hits, 0)
+
+    def test_large_bodies_are_not_cached(self):
+        parser = CountingJSONParser(ResultCache(8, 60))
+        parser.max_cached_body = 10
+
+        for _ in range(2):
+            self.parse_json(parser, {'item[name]': 'shirt'})
+
+        self.assertEqual(parser.parses, 2)
+
+    def test_django_cache(self):
+        cache = caches['default']
+        cache.clear()
+        parser = CountingJSONParser(cache)
+        data = {'item[tags][0]': 'new'}
+
+        for _ in range(2):
+            self.assertEqual(
+                self.parse_json(parser, data), {'item': {'tags': ['new']}}
+            )
+
+        self.assertEqual(parser.parses, 1)
+
+    def test_cached_stats(self):
+        """
+        a result taken from the cache is reported for `Server-Timing`
+        """
+        parser = CountingJSONParser(ResultCache(8, 60))
+        parser.server_timing = True
+        body = json.dumps({'item[tags][0]': 'new'}).encode('utf-8')
+
+        for cached in (False, True):
+            request = self.factory.post(
+                '/', body, content_type='application/json'
+            )
+            parser.parse(
+                BytesIO(body), 'application/json',
+                {'request': request, 'encoding': 'utf-8'}
+            )
+            stats = request.nested_form_stats
+
+            self.assertEqual(stats.cached, cached)
+            self.assertEqual(stats.node_count, 3)
+
+        self.assertEqual(stats.decode_time, 0)
+        self.assertEqual(stats.key_count, 0)
+
+    def test_result_cache(self):
+        cache = ResultCache(1, 60)
+        cache.set('a', {'x': [1]})
+        cache.set('b', {'y': [2]})
+
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(cache.get('b'), {'y': [2]})
+        self.assertIsNot(cache.get('b'), cache.get('b'))
+
+        cache.set('c', [3], timeout=-1)
+
+        self.assertIsNone(cache.get('c'))
+
+    def test_digest(self):
+        parser = NestedJSONParser()
+        digest = get_digest(parser, 'application/json', 'utf-8', b'{}')
+
+        self.assertEqual(
+            digest, get_digest(parser, 'application/json', 'utf-8', b'{}')
+        )
+        self.assertNotEqual(
+            digest, get_digest(parser, 'application/json', 'utf-8', b'[]')
+        )
+        self.assertNotEqual(
+            digest, get_digest(parser, 'text/json', 'utf-8', b'{}')
+        )
+
+    def test_digest_parser(self):
+        """
+        parsers with the same name or other options have their own keys
+        """
+        other_app_parser = type(
+            'NestedJSONParser', (NestedJSONParser,),
+            {'__module__': 'other_app.parsers'}
+        )
+        strict = NestedJSONParser()
+        strict.options = dict(strict.options, max_keys=1)
+        digests = {
+            get_digest(parser, 'application/json', 'utf-8', b'{}')
+            for parser in (NestedJSONParser(), other_app_parser(), strict)
+        }
+
+        self.assertEqual(len(digests), 3)
+        self.assertEqual(
+            get_digest(strict, 'application/json', 'utf-8', b'{}'),
+            get_digest(strict, 'application/json', 'utf-8', b'{}')
+        )
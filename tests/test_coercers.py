@@ -0,0 +1,163 @@
+import datetime
+import decimal
+
+from django.http import QueryDict
+from django.test import SimpleTestCase
+
+from drf_nested_forms.coercers import (
+    CoercionTable, coerce_decimal, coerce_float, coerce_iso_datetime,
+    default_table, get_default_table, key_path
+)
+from drf_nested_forms.exceptions import ParseError
+from drf_nested_forms.tokenizer import key_cache
+from drf_nested_forms.utils import NestedForm, NestedFormBuilder
+
+
+class CoercionTableTestCase(SimpleTestCase):
+
+    def test_default_table(self):
+        values = {
+            'null': None, 'true': True, 'false': False, '[]': [], '{}': {},
+            '0': 0, '123': 123, '007': 7, '': '', 'nullable': 'nullable',
+            'True': 'True', '-1': '-1', '1.5': '1.5', '٣': '٣',
+            '[1]': '[1]', 'name': 'name',
+        }
+
+        for value, expected in values.items():
+            coerced = default_table.coerce(value)
+            self.assertEqual(coerced, expected, value)
+            self.assertIs(type(coerced), type(expected), value)
+
+        self.assertIsNot(default_table.coerce('[]'), default_table.coerce('[]'))
+        self.assertEqual(default_table.coerce(12.5), 12.5)
+
+    def test_max_digits(self):
+        table = default_table.copy(max_digits=3)
+
+        self.assertEqual(table.coerce('999'), 999)
+        self.assertEqual(table.coerce('1000'), '1000')
+        self.assertEqual(default_table.coerce('1000'), 1000)
+        self.assertEqual(default_table.coerce('1' * 5000), '1' * 5000)
+
+    def test_register(self):
+        table = get_default_table()
+        table.register('-.0123456789', coerce_float)
+        table.register_literal('none', None)
+
+        self.assertEqual(table.coerce('12'), 12)
+        self.assertEqual(table.coerce('-1.5'), -1.5)
+        self.assertEqual(table.coerce('.5'), 0.5)
+        self.assertEqual(table.coerce('1e'), '1e')
+        self.assertEqual(table.coerce('-'), '-')
+        self.assertIsNone(table.coerce('none'))
+        self.assertEqual(table.coerce('nonE'), 'nonE')
+        # the default table is left alone
+        self.assertEqual(default_table.coerce('-1.5'), '-1.5')
+
+    def test_optional_coercers(self):
+        table = CoercionTable()
+        table.register('0123456789-', coerce_decimal)
+        self.assertEqual(table.coerce('12.50'), decimal.Decimal('12.50'))
+        self.assertEqual(table.coerce('-'), '-')
+
+        table = CoercionTable()
+        table.register('0123456789', coerce_iso_datetime)
+        self.assertEqual(
+            table.coerce('2021-05-01'), datetime.date(2021, 5, 1)
+        )
+        self.assertEqual(
+            table.coerce('2021-05-01T10:30:00'),
+            datetime.datetime(2021, 5, 1, 10, 30)
+        )
+        self.assertEqual(table.coerce('2021-13-01'), '2021-13-01')
+        self.assertEqual(table.coerce('12'), '12')
+
+    def test_key_path(self):
+        paths = {
+            'name': 'name',
+            'item[attribute][3][price]': 'item[attribute][][price]',
+            '[0][tags][]': '[][tags][]',
+            '[item][size]': '[item][size]',
+        }
+
+        for key, path in paths.items():
+            self.assertEqual(key_path(key_cache.tokenize(key)), path)
+
+
+class PathCoercerTestCase(SimpleTestCase):
+    data = {
+        'item[price]': '12.50',
+        'item[variants][0][price]': '3',
+        'item[variants][1][price]': '4.25',
+        'item[variants][1][stock]': '12',
+        'item[count]': '5',
+    }
+    coercers = {
+        'item[price]': decimal.Decimal,
+        'item[variants][][price]': decimal.Decimal,
+    }
+
+    def test_path_coercers(self):
+        form = NestedForm(self.data, coercers=self.coercers)
+        form.is_nested(raise_exception=True)
+
+        self.assertEqual(form.data, {
+            'item': {
+                'price': decimal.Decimal('12.50'),
+                'variants': [
+                    {'price': decimal.Decimal('3')},
+                    {'price': decimal.Decimal('4.25'), 'stock': 12},
+                ],
+                'count': 5,
+            }
+        })
+
+        builder = NestedFormBuilder(coercers=self.coercers)
+
+        for key, value in self.data.items():
+            builder.feed(key, value)
+
+        self.assertEqual(builder.close(), form.data)
+
+    def test_repeated_keys(self):
+        """
+        a per path coercer applies to every value of a repeated key
+        """
+        coercers = {'item[prices][]': decimal.Decimal}
+        expected = {
+            'item': {
+                'prices': [decimal.Decimal('1.5'), decimal.Decimal('2.5')]
+            }
+        }
+
+        body = 'item[prices][]=1.5&item[prices][]=2.5'
+        form = NestedForm(QueryDict(body), coercers=coercers)
+        form.is_nested(raise_exception=True)
+
+        self.assertEqual(form.data, expected)
+
+        builder = NestedFormBuilder(coercers=coercers)
+        builder.feed('item[prices][]', '1.5')
+        builder.feed('item[prices][]', '2.5')
+
+        self.assertEqual(builder.close(), expected)
+
+        form = NestedForm(QueryDict('item[prices][]=1.5'), coercers=coercers)
+        form.is_nested(raise_exception=True)
+
+        self.assertEqual(
+            form.data, {'item': {'prices': [decimal.Decimal('1.5')]}}
+        )
+
+    def test_invalid_value(self):
+        data = dict(self.data, **{'item[price]': 'cheap'})
+        form = NestedForm(data, coercers=self.coercers)
+
+        with self.assertRaisesMessage(ParseError, 'item[price]'):
+            form.is_nested(raise_exception=True)
+
+    def test_max_digits_option(self):
+        form = NestedForm({'item[count]': '12345'}, max_digits=4)
+        form.is_nested(raise_exception=True)
+
+        self.assertEqual(form.data, {'item': {'count': '12345'}})
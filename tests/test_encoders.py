@@ -0,0 +1,105 @@
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import SimpleTestCase
+from django.test.client import RequestFactory
+from rest_framework.request import Request
+
+from drf_nested_forms.encoders import (
+    MultiPartEncoder, encode_value, iter_nested_items
+)
+from drf_nested_forms.parsers import NestedMultiPartParser
+from drf_nested_forms.utils import NestedForm
+
+
+class EncoderTestCase(SimpleTestCase):
+    data = {
+        'item': {
+            'attribute': [
+                {'user_type': 'size', 'verbose': ['bazz', 'foo']},
+                {'user_type': None, 'verbose': []},
+            ],
+            'variant': {'vendor_metric': {}, 'in_stock': True},
+            'foo-bar': {'baaz': False, 'count': 42},
+        },
+        'with space': {'ok': ''},
+        'name': 'shirt',
+    }
+
+    def decode(self, pairs):
+        form = NestedForm(dict(pairs), allow_empty=True)
+        form.is_nested(raise_exception=True)
+
+        return form.data
+
+    def test_pairs(self):
+        self.assertEqual(list(iter_nested_items({'item': {'tags': ['new']}})), [
+            ('item[tags][0]', 'new')
+        ])
+        self.assertEqual(list(iter_nested_items([{'a': 1}, 'b'])), [
+            ('[0][a]', '1'), ('[1]', 'b')
+        ])
+
+    def test_special_values(self):
+        for value, encoded in (
+            (None, 'null'), (True, 'true'), (False, 'false'),
+            ([], '[]'), ({}, '{}'), (12, '12'), ('', ''), (b'xy', b'xy'),
+        ):
+            self.assertEqual(encode_value(value), encoded)
+
+    def test_round_trip(self):
+        """
+        a nested form decodes the pairs back into the same object
+        """
+        self.assertEqual(self.decode(iter_nested_items(self.data)), self.data)
+
+        data = [{'attribute': 'size', 'verbose': [None, ['a']]}, [{}], 5]
+        self.assertEqual(self.decode(iter_nested_items(data)), data)
+
+    def test_lazy(self):
+        """
+        pairs are yielded while the object is walked
+        """
+        data = {'items': [{'id': index} for index in range(100000)]}
+        pairs = iter_nested_items(data)
+
+        self.assertEqual(next(pairs), ('items[0][id]', '0'))
+        self.assertEqual(next(pairs), ('items[1][id]', '1'))
+
+    def test_multipart_round_trip(self):
+        image = SimpleUploadedFile(
+            'hp.jpeg', b'hp_pic' * 100, content_type='image/jpeg'
+        )
+        data = dict(self.data, gallery=[{'image': image, 'caption': 'front'}])
+        encoder = MultiPartEncoder(data)
+        encoder.chunk_size = 64
+
+        chunks = list(encoder)
+        request = RequestFactory().generic(
+            'POST', '/', b''.join(chunks), content_type=encoder.content_type
+        )
+        parser = NestedMultiPartParser()
+        parser.options = dict(parser.options, allow_empty=True)
+        decoded = Request(request, parsers=[parser]).data
+
+        uploaded = decoded['gallery'][0].pop('image')
+
+        self.assertGreater(len(chunks), 10)
+        self.assertEqual(uploaded.name, 'hp.jpeg')
+        self.assertEqual(uploaded.read(), b'hp_pic' * 100)
+        self.assertEqual(decoded, dict(self.data, gallery=[{'caption': 'front'}]))
+
+    def test_multipart_bytes(self):
+        """
+        bytes are written to the part body as they are
+        """
+        encoder = MultiPartEncoder({'a': {'blob': b'x\xffy'}})
+        body = b''.join(encoder)
+
+        self.assertIn(b'\r\n\r\nx\xffy\r\n', body)
+
+        encoder = MultiPartEncoder({'a': {'blob': b'xy'}})
+        request = RequestFactory().generic(
+            'POST', '/', b''.join(encoder), content_type=encoder.content_type
+        )
+        decoded = Request(request, parsers=[NestedMultiPartParser()]).data
+
+        self.assertEqual(decoded, {'a': {'blob': 'xy'}})
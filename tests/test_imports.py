@@ -0,0 +1,78 @@
+import json
+import os
+import subprocess
+import sys
+
+from django.test import SimpleTestCase
+
+import drf_nested_forms
+from drf_nested_forms import parsers
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMPORT_SCRIPT = '''
+import json, sys, time
+
+start = time.perf_counter()
+import drf_nested_forms
+%s
+elapsed = time.perf_counter() - start
+
+form = drf_nested_forms.NestedForm({'item[tags][0]': 'new'})
+form.is_nested()
+
+print(json.dumps({
+    'elapsed': elapsed,
+    'data': form.data,
+    'modules': sorted(
+        name for name in sys.modules
+        if name.split('.')[0] in ('django', 'rest_framework')
+    ),
+}))
+'''
+
+
+class ImportTestCase(SimpleTestCase):
+
+    def run_import(self, extra='', settings_module=None):
+        env = dict(os.environ, PYTHONPATH=ROOT)
+        env.pop('DJANGO_SETTINGS_MODULE', None)
+
+        if settings_module:
+            env['DJANGO_SETTINGS_MODULE'] = settings_module
+
+        output = subprocess.check_output(
+            [sys.executable, '-c', IMPORT_SCRIPT % extra], env=env, cwd=ROOT
+        )
+
+        return json.loads(output)
+
+    def test_core_without_django(self):
+        result = self.run_import()
+
+        self.assertEqual(result['modules'], [])
+        self.assertEqual(result['data'], {'item': {'tags': ['new']}})
+
+    def test_import_time(self):
+        core = self.run_import()
+        full = self.run_import(
+            'import django; django.setup(); drf_nested_forms.NestedJSONParser',
+            settings_module='tests.settings'
+        )
+
+        self.assertIn('rest_framework.parsers', full['modules'])
+        self.assertLess(core['elapsed'], full['elapsed'])
+
+    def test_lazy_parsers(self):
+        self.assertIs(
+            drf_nested_forms.NestedJSONParser, parsers.NestedJSONParser
+        )
+        self.assertIs(
+            drf_nested_forms.NestedMultiPartParser,
+            parsers.NestedMultiPartParser
+        )
+        self.assertIn('NestedJSONParser', dir(drf_nested_forms))
+
+        with self.assertRaises(AttributeError):
+            drf_nested_forms.NestedFormParserr
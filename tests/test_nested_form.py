@@ -1,9 +1,16 @@
+import copy
+import json
+import pickle
 import unittest
 
 from django.http import QueryDict
 
-from drf_nested_forms.utils import NestedForm
+from drf_nested_forms.utils import (
+    MultiValueMapping, NestedForm, NestedFormBatch, NestedFormBuilder,
+    PendingTree, decode_many
+)
 from drf_nested_forms.exceptions import ParseError
+from drf_nested_forms.tokenizer import key_cache
 
 
 class NestedFormTestCase(unittest.TestCase):
@@ -274,6 +281,33 @@ class NestedFormTestCase(unittest.TestCase):
 
         self.assertEqual(form.data, expected_output)
 
+    def test_multi_value_data(self):
+        """
+        test the values of a multi value dict are read as they are looked up
+        """
+        data = QueryDict(mutable=True)
+        data.setlist('item[tags][]', ['new', 'sale'])
+        data.setlist('item[name]', ['shirt'])
+        data.setlist('item[sizes]', [])
+
+        form = NestedForm(data)
+        mapping = form._initial_data
+
+        self.assertIsInstance(mapping, MultiValueMapping)
+        self.assertEqual(len(mapping), 3)
+        self.assertEqual(mapping['item[name]'], 'shirt')
+        self.assertEqual(mapping['item[tags][]'], ['new', 'sale'])
+        # the list of values of the multi value dict is never handed out
+        mapping['item[tags][]'].append('old')
+        self.assertEqual(data.getlist('item[tags][]'), ['new', 'sale'])
+        self.assertEqual(mapping['item[sizes]'], [])
+
+        form.is_nested(raise_exception=True)
+
+        self.assertEqual(form.data, {
+            'item': {'tags': ['new', 'sale'], 'name': 'shirt', 'sizes': None}
+        })
+
     def test_data_9(self):
         """
         test that will will throw a too many consecutive empty arrays
@@ -313,3 +347,438 @@ class NestedFormTestCase(unittest.TestCase):
             self.fail(
                 f"NestedForm failed with an unhandled exception ({e})"
             )
+
+    def test_data_11(self):
+        """
+        test deeply nested keys are built into the same path
+        """
+        data = {
+            'config[a][b][c][d][e][0][f][g][h][i]': 'deep',
+            'config[a][b][c][d][e][0][f][g][h][j]': '12',
+            'config[a][b][c][d][e][1][f][]': 'null',
+            'config[a][b][k]': 'true',
+        }
+
+        expected_output = {
+            'config': {
+                'a': {
+                    'b': {
+                        'c': {
+                            'd': {
+                                'e': [
+                                    {'f': {'g': {'h': {'i': 'deep', 'j': 12}}}},
+                                    {'f': [None]}
+                                ]
+                            }
+                        },
+                        'k': True
+                    }
+                }
+            }
+        }
+
+        form = NestedForm(data)
+        form.is_nested(raise_exception=True)
+
+        self.assertEqual(form.data, expected_output)
+
+    def test_data_12(self):
+        """
+        test many namespaces keep the order they are first seen in
+        """
+        data = {}
+
+        for position in range(150):
+            data['ns%d[value]' % position] = str(position)
+            data['ns%d[items][]' % position] = 'x'
+
+        data['plain'] = 'null'
+
+        form = NestedForm(data)
+        form.is_nested(raise_exception=True)
+
+        self.assertEqual(
+            list(form.data.keys()),
+            ['ns%d' % position for position in range(150)] + ['plain']
+        )
+        self.assertEqual(form.data['ns42'], {'value': 42, 'items': ['x']})
+        self.assertIsNone(form.data['plain'])
+
+
+class NestedFormBuilderTestCase(unittest.TestCase):
+
+    def test_same_as_nested_form(self):
+        """
+        fields fed one at a time give the same object as `NestedForm`
+        """
+        data = {
+            '[0][attribute]': 'size',
+            '[0][verbose][0]': 'bazz',
+            '[0][verbose][1]': 'foo',
+            '[0][variant][vendor_metric]': '456',
+            'item[attribute][0][user_type]': 'size',
+            'item[attribute][3][user_type]': 'color',
+            'item[verbose][]': '[]',
+            'item[foo][baaz]': 'null',
+            'next[verbose][][user_type_1]': 'seller',
+            'next[verbose][][user_type_2]': 'buyer',
+            '[variant][]': 'color',
+            'plain': 'true',
+        }
+
+        form = NestedForm(data, allow_empty=True)
+        form.is_nested(raise_exception=True)
+
+        builder = NestedFormBuilder(allow_empty=True)
+        builder.feed_items(data.items())
+
+        self.assertTrue(builder.nested)
+        self.assertEqual(builder.close(), form.data)
+        self.assertEqual(builder.data, form.data)
+
+    def test_repeated_keys(self):
+        """
+        a repeated key is decoded like a `QueryDict` key with many values
+        """
+        data = QueryDict(mutable=True)
+        data.setlist('[variant][]', ['color', 'size'])
+        data.setlist('[verbose]', ['bazz', 'foo', 'baaz'])
+        data.setdefault('[other][0]', 'true')
+
+        form = NestedForm(data)
+        form.is_nested(raise_exception=True)
+
+        builder = NestedFormBuilder()
+
+        for key, values in data.lists():
+            for value in values:
+                builder.feed(key, value)
+
+        self.assertEqual(builder.close(), form.data)
+        self.assertEqual(form.data, {
+            'variant': ['color', 'size'],
+            'verbose': ['bazz', 'foo', 'baaz'],
+            'other': [True],
+        })
+
+    def test_not_nested(self):
+        """
+        the builder tells when none of the keys was nested
+        """
+        builder = NestedFormBuilder()
+        builder.feed('vendor_metric', 'L')
+
+        self.assertFalse(builder.nested)
+        self.assertEqual(builder.close(), {'vendor_metric': 'L'})
+
+    def test_feed_after_close(self):
+        builder = NestedFormBuilder()
+        builder.close()
+
+        with self.assertRaises(AssertionError):
+            builder.feed('item[a]', 'b')
+
+
+class LazyNestedFormTestCase(unittest.TestCase):
+
+    data = {
+        'meta[source]': 'webhook',
+        'meta[retries]': '3',
+        'payload[items][0][sku]': 'A1',
+        'payload[items][1][sku]': 'B2',
+        'payload[total]': '20',
+        '[flag]': 'true',
+        'plain': 'null',
+    }
+
+    def get_data(self, **options):
+        form = NestedForm(self.data, **options)
+        form.is_nested(raise_exception=True)
+
+        return form.data
+
+    def test_namespaces_are_decoded_when_read(self):
+        data = self.get_data(lazy=True)
+
+        self.assertIsInstance(dict.__getitem__(data, 'payload'), PendingTree)
+        self.assertEqual(data['meta'], {'source': 'webhook', 'retries': 3})
+        self.assertIsInstance(dict.__getitem__(data, 'payload'), PendingTree)
+        self.assertIs(data['meta'], data['meta'])
+
+        # non namespaced keys are decoded straight away
+        self.assertIs(dict.__getitem__(data, 'flag'), True)
+        self.assertIsNone(dict.__getitem__(data, 'plain'))
+
+    def test_behaves_like_a_dict(self):
+        expected_output = self.get_data()
+
+        self.assertEqual(self.get_data(lazy=True), expected_output)
+        self.assertEqual(dict(self.get_data(lazy=True)), expected_output)
+        self.assertEqual({**self.get_data(lazy=True)}, expected_output)
+        self.assertEqual(copy.deepcopy(self.get_data(lazy=True)), expected_output)
+        self.assertEqual(
+            pickle.loads(pickle.dumps(self.get_data(lazy=True))),
+            expected_output
+        )
+        self.assertEqual(
+            json.loads(json.dumps(self.get_data(lazy=True))),
+            expected_output
+        )
+        self.assertEqual(
+            list(self.get_data(lazy=True).items()),
+            list(expected_output.items())
+        )
+        self.assertEqual(self.get_data(lazy=True).get('payload'), expected_output['payload'])
+        self.assertEqual(self.get_data(lazy=True), self.get_data(lazy=True))
+
+    def test_builder(self):
+        """
+        the builder only collects the fields of a namespace in lazy mode
+        """
+        builder = NestedFormBuilder(lazy=True)
+        builder.feed_items(self.data.items())
+        builder.feed('meta[tags][]', 'a')
+        builder.feed('meta[tags][]', 'b')
+
+        data = builder.close()
+
+        self.assertIsInstance(dict.__getitem__(data, 'meta'), PendingTree)
+        self.assertEqual(data['meta'], {
+            'source': 'webhook', 'retries': 3, 'tags': ['a', 'b']
+        })
+
+
+    def test_parse_errors_are_not_deferred(self):
+        """
+        a namespace that could fail to decode is decoded straight away
+        so the error is raised while parsing
+        """
+        forms = (
+            ({'tags[0]': 'a', 'tags[5000]': 'b'}, {}),
+            ({'tags[0]': 'a', 'tags[3]': 'b'}, {'max_placeholders': 1}),
+            ({'item[count]': 'many'}, {'coercers': {'item[count]': int}}),
+        )
+
+        for data, options in forms:
+            form = NestedForm(data, lazy=True, **options)
+
+            with self.assertRaises(ParseError):
+                form.is_nested()
+
+            builder = NestedFormBuilder(lazy=True, **options)
+            builder.feed_items(data.items())
+
+            with self.assertRaises(ParseError):
+                builder.close()
+
+        data = self.get_data(lazy=True, coercers={'meta[retries]': int})
+
+        self.assertIsInstance(dict.__getitem__(data, 'meta'), PendingTree)
+        self.assertEqual(data['meta']['retries'], 3)
+
+
+class SparseListTestCase(unittest.TestCase):
+    data = {
+        'item[attribute][0][user_type]': 'size',
+        'item[attribute][3][user_type]': 'color',
+        'item[attribute][7][tags][5]': 'sale',
+        'item[name]': 'shirt',
+        '[9]': 'last',
+    }
+
+    def get_data(self, **options):
+        form = NestedForm(self.data, **options)
+        form.is_nested(raise_exception=True)
+
+        return form.data
+
+    def test_padded_by_default(self):
+        """
+        gaps are filled with `None` unless a sparse mode is set
+        """
+        data = self.get_data()
+
+        self.assertEqual(data['item']['attribute'][1:3], [None, None])
+        self.assertEqual(data[''], [None] * 9 + ['last'])
+
+    def test_dict_mode(self):
+        """
+        a list with a gap becomes a mapping of its indices
+        """
+        self.assertEqual(self.get_data(sparse_lists='dict'), {
+            'item': {
+                'attribute': {
+                    0: {'user_type': 'size'},
+                    3: {'user_type': 'color'},
+                    7: {'tags': {5: 'sale'}},
+                },
+                'name': 'shirt',
+            },
+            '': [None] * 9 + ['last'],
+        })
+
+    def test_compact_mode(self):
+        """
+        a list with a gap keeps only the values that were sent
+        """
+        expected_output = {
+            'item': {
+                'attribute': [
+                    {'user_type': 'size'},
+                    {'user_type': 'color'},
+                    {'tags': ['sale']},
+                ],
+                'name': 'shirt',
+            },
+            '': [None] * 9 + ['last'],
+        }
+
+        self.assertEqual(self.get_data(sparse_lists='compact'), expected_output)
+
+        builder = NestedFormBuilder(sparse_lists='compact')
+        builder.feed_items(self.data.items())
+
+        self.assertEqual(builder.close(), expected_output)
+
+    def test_large_index(self):
+        """
+        sparse modes never allocate placeholders for large indices
+        """
+        form = NestedForm({'tags[5000]': 'a'}, sparse_lists='dict')
+        form.is_nested()
+
+        self.assertEqual(form.data, {'tags': {5000: 'a'}})
+
+    def test_max_placeholders(self):
+        """
+        the placeholders of the whole form are limited
+        """
+        data = {'a[0]': 1, 'a[500]': 2, 'b[0]': 1, 'b[600]': 2}
+
+        form = NestedForm(data, max_placeholders=1200)
+        form.is_nested()
+        self.assertEqual(len(form.data['b']), 601)
+
+        with self.assertRaises(ParseError):
+            NestedForm(data, max_placeholders=1000).is_nested()
+
+    def test_unknown_mode(self):
+        with self.assertRaises(ValueError):
+            NestedForm({}, sparse_lists='list')
+
+
+class DecodeBudgetTestCase(unittest.TestCase):
+    data = {
+        'item[name]': 'shirt',
+        'item[attribute][0][user_type]': 'size',
+        'item[attribute][3][user_type]': 'color',
+        'item[attribute][3][tags][]': 'sale',
+    }
+
+    def test_within_budgets(self):
+        form = NestedForm(
+            self.data, max_keys=4, max_depth=4, max_list_index=3, max_nodes=8
+        )
+
+        self.assertTrue(form.is_nested())
+
+    def test_over_budgets(self):
+        """
+        every budget is checked before the tree is built
+        """
+        budgets = (
+            {'max_keys': 3},
+            {'max_depth': 3},
+            {'max_list_index': 2},
+            {'max_nodes': 7},
+        )
+
+        for budget in budgets:
+            form = NestedForm(self.data, **budget)
+
+            with self.assertRaises(ParseError, msg=budget):
+                form.is_nested()
+
+            self.assertFalse(hasattr(form, '_final_data'))
+
+    def test_long_key(self):
+        """
+        nodes are counted as they are seen and the key is shortened
+        in the message
+        """
+        key = 'item' + '[a]' * 5000
+
+        for budget in ({'max_nodes': 10}, {'max_depth': 10}):
+            form = NestedForm({key: 'size'}, **budget)
+
+            with self.assertRaises(ParseError) as context:
+                form.is_nested()
+
+            self.assertLess(len(str(context.exception)), 200)
+
+        # counting stops at the first node over the budget
+        form = NestedForm({key: 'size'}, max_nodes=10)
+
+        with self.assertRaises(ParseError):
+            form._count_nodes(key_cache.tokenize(key))
+
+        self.assertEqual(len(form._nodes), 11)
+
+    def test_builder(self):
+        """
+        the builder checks every key as it is fed
+        """
+        builder = NestedFormBuilder(max_keys=3)
+        items = iter(self.data.items())
+
+        builder.feed_items([next(items) for _ in range(3)])
+
+        with self.assertRaises(ParseError):
+            builder.feed(*next(items))
+
+
+class NestedFormBatchTestCase(unittest.TestCase):
+    rows = [
+        {'id': '1', 'item[tags][0]': 'new', 'item[price][amount]': '12'},
+        {'id': '2', 'item[tags][0]': 'sale', 'item[price][amount]': 'null'},
+        {'name': 'plain'},
+        {'[0][id]': '3', '[1][id]': '4'},
+        {'id': '5', 'item[tags][0]': '', 'item[price][amount]': '7'},
+    ]
+
+    def test_same_as_nested_form(self):
+        """
+        every row is decoded like a nested form, plain rows as they are
+        """
+        for options in ({}, {'allow_blank': False}):
+            expected = []
+
+            for row in self.rows:
+                form = NestedForm(row, **options)
+                expected.append(form.data if form.is_nested() else row)
+
+            self.assertEqual(list(decode_many(self.rows, **options)), expected)
+
+    def test_shared_layouts(self):
+        """
+        rows with the same keys share their layout
+        """
+        batch = NestedFormBatch()
+        decoded = list(batch.decode(self.rows))
+
+        self.assertEqual(len(batch._layouts), 3)
+        self.assertIsNone(batch._layouts[('name',)])
+        self.assertIsNot(decoded[0]['item'], decoded[1]['item'])
+
+    def test_query_dicts(self):
+        rows = [QueryDict('item[tags][]=a&item[tags][]=b'), QueryDict('item[tags][]=c')]
+
+        self.assertEqual(list(decode_many(rows)), [
+            {'item': {'tags': ['a', 'b']}}, {'item': {'tags': ['c']}}
+        ])
+
+    def test_budgets(self):
+        rows = iter(decode_many(self.rows, max_depth=1))
+
+        with self.assertRaises(ParseError):
+            next(rows)
@@ -0,0 +1,248 @@
+import json
+from io import BytesIO
+
+from django.core.exceptions import TooManyFieldsSent
+from django.http import QueryDict
+from django.test import SimpleTestCase, override_settings
+from rest_framework.exceptions import ParseError
+
+from drf_nested_forms.instrumentation import measure_tree
+from drf_nested_forms.parsers import (
+    NestedFormParser, NestedJSONParser, get_json_decoder,
+    may_have_bracketed_key, split_urlencoded
+)
+from drf_nested_forms.utils import NestedForm
+
+
+class RecordingJSONParser(NestedJSONParser):
+
+    def __init__(self):
+        self.reports = []
+
+    def get_parse_hook(self):
+        return lambda stats, request: self.reports.append(stats)
+
+
+class StdlibDecoderJSONParser(NestedJSONParser):
+    json_decoder = staticmethod(get_json_decoder('json.loads'))
+
+
+class NestedJSONParserTestCase(SimpleTestCase):
+
+    def parse(self, data, parser=None):
+        parser = parser or NestedJSONParser()
+        stream = BytesIO(json.dumps(data).encode('utf-8'))
+
+        return parser.parse(stream, 'application/json', {})
+
+    def test_plain_json(self):
+        """
+        plain JSON is returned as it is
+        """
+        data = {'item': {'attribute': ['size']}, 'foo': 'null'}
+
+        self.assertEqual(self.parse(data), data)
+        self.assertEqual(self.parse([data]), [data])
+        self.assertEqual(self.parse({}), {})
+
+    def test_nested_json(self):
+        data = {'foo': 'bar', 'item[attribute][0]': 'size'}
+
+        self.assertEqual(self.parse(data), {
+            'foo': 'bar',
+            'item': {'attribute': ['size']}
+        })
+
+    def test_first_key_check(self):
+        """
+        only the first key is checked with the `first` check
+        """
+        parser = NestedJSONParser()
+        parser.nested_check = 'first'
+
+        self.assertEqual(
+            self.parse({'item[a]': 'b', 'foo': 'bar'}, parser),
+            {'item': {'a': 'b'}, 'foo': 'bar'}
+        )
+        self.assertEqual(
+            self.parse({'foo': 'bar', 'item[a]': 'b'}, parser),
+            {'foo': 'bar', 'item[a]': 'b'}
+        )
+
+    def test_json_decoder(self):
+        """
+        the first installed decoder is used, the `json` module otherwise
+        """
+        self.assertIs(
+            get_json_decoder(('not_installed.loads', 'json.loads')),
+            json.loads
+        )
+        self.assertIsNone(get_json_decoder('not_installed.loads'))
+        self.assertIsNone(get_json_decoder(None))
+
+        # a decoder can be given as it is and bad paths are skipped
+        self.assertIs(get_json_decoder(json.loads), json.loads)
+        self.assertIs(get_json_decoder([json.loads]), json.loads)
+
+        for path in ('json', 'json.not_a_decoder', 'not_installed'):
+            self.assertIsNone(get_json_decoder(path))
+            self.assertIs(get_json_decoder((path, 'json.loads')), json.loads)
+
+        bodies = []
+        parser = NestedJSONParser()
+        parser.json_decoder = lambda body: bodies.append(body) or json.loads(body)
+        data = {'foo': 'bar', 'item[attribute][0]': 'size'}
+
+        self.assertEqual(self.parse(data, parser), self.parse(data))
+        self.assertIsInstance(bodies[0], bytes)
+
+        with self.assertRaises(ParseError):
+            parser.parse(BytesIO(b'{"foo":'), 'application/json', {})
+
+        # a python function set on the class is not bound to the parser
+        self.assertEqual(
+            self.parse(data, StdlibDecoderJSONParser()), self.parse(data)
+        )
+        self.assertIsInstance(
+            NestedJSONParser.__dict__['json_decoder'], staticmethod
+        )
+
+    def test_invalid_json(self):
+        with self.assertRaises(ParseError):
+            NestedJSONParser().parse(BytesIO(b'{"foo": NaN}'))
+
+    def test_encoding(self):
+        body = json.dumps({'item[name]': 'caf\u00e9'}).encode('utf-16')
+
+        for decoder in (None, json.loads):
+            parser = NestedJSONParser()
+            parser.json_decoder = decoder
+
+            self.assertEqual(
+                parser.parse(BytesIO(body), None, {'encoding': 'utf-16'}),
+                {'item': {'name': 'caf\u00e9'}}
+            )
+
+    def test_bracket_check(self):
+        """
+        JSON without a `]` is returned without checking its keys
+        """
+        self.assertFalse(may_have_bracketed_key(b'{"item": "[a"}'))
+        self.assertTrue(may_have_bracketed_key(b'{"item[a]": 1}'))
+        self.assertTrue(may_have_bracketed_key(b'{"item[a\\u005D": 1}'))
+
+        parser = NestedJSONParser()
+        parser.may_be_nested = None
+
+        self.assertEqual(self.parse({'item': '[a'}, parser), {'item': '[a'})
+        self.assertEqual(
+            NestedJSONParser().parse(BytesIO(b'{"item[a\\u005d": "b"}')),
+            {'item': {'a': 'b'}}
+        )
+
+    def test_over_budget(self):
+        """
+        a form over a decode budget is a bad request
+        """
+        parser = NestedJSONParser()
+        parser.options = dict(parser.options, max_depth=1)
+
+        with self.assertRaises(ParseError):
+            self.parse({'item[attribute][0]': 'size'}, parser)
+
+    def test_parse_hook(self):
+        """
+        the hook receives the timings and shape of every parse
+        """
+        parser = RecordingJSONParser()
+
+        self.parse({'item[attribute][0][size]': '1', 'name': 'x'}, parser)
+        self.parse({'name': 'x'}, parser)
+
+        nested, plain = parser.reports
+
+        self.assertEqual(nested.parser, 'RecordingJSONParser')
+        self.assertEqual(nested.key_count, 2)
+        self.assertEqual(nested.max_depth, 4)
+        self.assertEqual(nested.node_count, 5)
+        self.assertFalse(nested.fast_path)
+        self.assertGreaterEqual(nested.base_time, 0)
+        self.assertGreaterEqual(nested.decode_time, 0)
+        self.assertTrue(plain.fast_path)
+        self.assertEqual(plain.node_count, 0)
+
+    def test_measure_tree(self):
+        image = BytesIO(b'image')
+
+        self.assertEqual(measure_tree({}), (0, 1, 0))
+        self.assertEqual(
+            measure_tree({'a': [1, {'b': image}], 'c': None}), (5, 3, 1)
+        )
+
+
+class BudgetFormParser(NestedFormParser):
+    options = {'max_keys': 2}
+
+
+class NestedFormParserTestCase(SimpleTestCase):
+
+    def parse(self, body, parser=None):
+        parser = parser or NestedFormParser()
+
+        return parser.parse(
+            BytesIO(body), 'application/x-www-form-urlencoded', {}
+        )
+
+    def expected(self, body):
+        form = NestedForm(QueryDict(body), allow_empty=False, allow_blank=True)
+        form.is_nested()
+
+        return form.data
+
+    def test_split(self):
+        self.assertEqual(
+            split_urlencoded(b'a=1&&b&c='),
+            [(0, 1, 3), (5, 6, 6), (7, 8, 9)]
+        )
+        self.assertEqual(split_urlencoded(b''), [])
+
+    def test_plain_form(self):
+        """
+        a form without a bracketed key is returned as a `QueryDict`
+        """
+        data = self.parse(b'name=shirt&size=large&size=small')
+
+        self.assertIsInstance(data, QueryDict)
+        self.assertEqual(data.getlist('size'), ['large', 'small'])
+
+    def test_nested_form(self):
+        bodies = [
+            b'item[name]=blue+shirt&item[tags][]=new&item[tags][]=sale',
+            b'item%5Bprice%5D=12&item%5bnote%5D=50%25+off&plain=null',
+            b'item[attribute][0][size]=&item[attribute][1][size]=l&&x',
+            b'[0][name]=caf%C3%A9&[1][name]=%E2%9C%93&[1][tags][]=[]',
+            b'item[a+b]=1&item[%26]=%3D&item[%ZZ]=bad%',
+        ]
+
+        for body in bodies:
+            data = self.parse(body)
+
+            self.assertNotIsInstance(data, QueryDict)
+            self.assertEqual(data, self.expected(body), body)
+
+    def test_not_nested(self):
+        """
+        a bracket that does not make a nested key is a plain form
+        """
+        data = self.parse(b'item[=1&name]=2')
+
+        self.assertIsInstance(data, QueryDict)
+        self.assertEqual(data['item['], '1')
+
+    def test_limits(self):
+        with self.assertRaises(ParseError):
+            self.parse(b'a[0]=1&a[1]=2&a[2]=3', BudgetFormParser())
+
+        with override_settings(DATA_UPLOAD_MAX_NUMBER_FIELDS=2):
+            with self.assertRaises(TooManyFieldsSent):
+                self.parse(b'a[0]=1&a[1]=2&a[2]=3')
@@ -0,0 +1,136 @@
+import unittest
+
+from django.http import QueryDict
+from rest_framework import serializers
+
+from drf_nested_forms.plans import (
+    DICT, LIST, VALUE, PlannedNestedForm, compile_plan
+)
+from drf_nested_forms.utils import NestedForm
+
+
+class PriceSerializer(serializers.Serializer):
+    amount = serializers.IntegerField()
+    currency = serializers.CharField()
+
+
+class VariantSerializer(serializers.Serializer):
+    sku = serializers.CharField()
+    prices = PriceSerializer(many=True)
+    tags = serializers.ListField(child=serializers.CharField())
+    price = PriceSerializer()
+
+
+class ProductSerializer(serializers.Serializer):
+    name = serializers.CharField()
+    variants = VariantSerializer(many=True)
+    grid = serializers.ListField(child=serializers.ListField())
+
+
+class DecodePlanTestCase(unittest.TestCase):
+    plan = compile_plan(ProductSerializer)
+
+    def decode(self, data, plan=None, **options):
+        form = PlannedNestedForm(data, plan or self.plan, **options)
+        form.is_nested()
+
+        expected = NestedForm(data, **options)
+        expected.is_nested()
+
+        self.assertEqual(form.data, expected.data)
+        self.assertEqual(list(form.data), list(expected.data))
+
+        return form
+
+    def test_compile(self):
+        """
+        nested serializers are dicts, lists and `many=True` are lists
+        """
+        root = self.plan.root
+        variant = root.children['variants'].children
+
+        self.assertEqual(root.kind, DICT)
+        self.assertEqual(root.children['name'].kind, VALUE)
+        self.assertEqual(root.children['variants'].kind, LIST)
+        self.assertEqual(variant.kind, DICT)
+        self.assertEqual(variant.children['prices'].kind, LIST)
+        self.assertEqual(variant.children['tags'].kind, LIST)
+        self.assertEqual(variant.children['price'].kind, DICT)
+        self.assertEqual(root.children['grid'].children.kind, LIST)
+
+    def test_planned(self):
+        """
+        a form of the shape of the plan is decoded with the plan
+        """
+        data = {
+            'name': 'shirt',
+            'variants[0][sku]': 'S-1',
+            'variants[0][prices][0][amount]': '10',
+            'variants[0][prices][0][currency]': 'usd',
+            'variants[0][prices][1][amount]': '9',
+            'variants[0][tags][]': '[]',
+            'variants[0][price][amount]': 'null',
+            'variants[1][sku]': 'S-2',
+            'grid[0][0]': '1',
+            'grid[0][1]': '2',
+            'grid[1][0]': '3',
+        }
+
+        form = self.decode(data)
+
+        self.assertTrue(form.planned)
+        self.assertEqual(form.data['variants'][0]['prices'][0], {
+            'amount': 10, 'currency': 'usd'
+        })
+        self.assertEqual(form.data['grid'], [[1, 2], [3]])
+
+    def test_repeated_values(self):
+        data = QueryDict(
+            'name=shirt&variants[0][tags][]=new&variants[0][tags][]=sale'
+        )
+
+        form = self.decode(data)
+
+        self.assertTrue(form.planned)
+        self.assertEqual(form.data['variants'][0]['tags'], ['new', 'sale'])
+
+    def test_list_root(self):
+        plan = compile_plan(PriceSerializer(many=True))
+        form = self.decode({'[0][amount]': '1', '[1][currency]': 'usd'}, plan)
+
+        self.assertTrue(form.planned)
+        self.assertEqual(form.data, [{'amount': 1}, {'currency': 'usd'}])
+
+    def test_off_plan(self):
+        """
+        forms off the plan are decoded like any other nested form
+        """
+        forms = (
+            {'variants[0][sku]': 'S-1', 'variants[3][sku]': 'S-4'},
+            {'variants[0][colour]': 'red'},
+            {'name[first]': 'shirt'},
+            {'variants[]': 'S-1'},
+            {'[0][sku]': 'S-1'},
+            {'variants[0][sku]': 'S-1', 'variants[00][sku]': 'S-2'},
+            {'variants[0][price]': '{}', 'variants[0][price][amount]': '1'},
+        )
+
+        for data in forms:
+            self.assertFalse(self.decode(data, allow_empty=True).planned, data)
+
+    def test_resolved_once(self):
+        """
+        the path of a key is resolved once and looked up after it
+        """
+        plan = compile_plan(ProductSerializer)
+        data = {'variants[0][prices][0][amount]': '1', 'name': 'shirt'}
+
+        self.decode(data, plan)
+        moves = plan._paths['variants[0][prices][0][amount]']
+        self.decode(data, plan)
+
+        self.assertIs(plan._paths['variants[0][prices][0][amount]'], moves)
+        self.assertEqual(moves, (
+            ('variants', LIST), (0, DICT), ('prices', LIST), (0, DICT),
+            ('amount', None),
+        ))
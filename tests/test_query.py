@@ -0,0 +1,93 @@
+from django.http import QueryDict
+from django.test import SimpleTestCase
+from django.test.client import AsyncRequestFactory, RequestFactory
+from rest_framework.exceptions import ParseError
+from rest_framework.request import Request
+
+from drf_nested_forms.helpers import copy_tree
+from drf_nested_forms.query import (
+    NestedQueryParamsMixin, QueryCache, get_nested_query_params, query_cache
+)
+
+
+class NestedQueryParamsTestCase(SimpleTestCase):
+    factory = RequestFactory()
+    query_string = 'filter[price][gte]=10&filter[tags][]=a&filter[tags][]=b'
+
+    def setUp(self):
+        query_cache.clear()
+
+    def get_request(self, query_string=None):
+        return self.factory.get(
+            '/items/?%s' % (query_string or self.query_string)
+        )
+
+    def test_nested_query_params(self):
+        data = get_nested_query_params(self.get_request())
+
+        self.assertEqual(data, {
+            'filter': {'price': {'gte': 10}, 'tags': ['a', 'b']}
+        })
+
+    def test_non_ascii_query_params(self):
+        """
+        the query string is read like django reads it for `request.GET`
+        under WSGI and ASGI
+        """
+        path = '/items/?filter[cur]=\u20ac&filter[name]=caf\u00e9'
+
+        for factory in (self.factory, AsyncRequestFactory()):
+            request = factory.get(path)
+
+            self.assertEqual(
+                get_nested_query_params(request),
+                {'filter': {'cur': '\u20ac', 'name': 'caf\u00e9'}}
+            )
+            self.assertEqual(request.GET['filter[name]'], 'caf\u00e9')
+
+    def test_plain_query_params(self):
+        data = get_nested_query_params(self.get_request('page=2&page=3'))
+
+        self.assertIsInstance(data, QueryDict)
+        self.assertEqual(data.getlist('page'), ['2', '3'])
+
+    def test_cached_on_request(self):
+        request = self.get_request()
+        data = get_nested_query_params(request)
+
+        self.assertIs(get_nested_query_params(request), data)
+        self.assertIs(get_nested_query_params(Request(request)), data)
+
+        view = NestedQueryParamsMixin()
+        view.request = Request(request)
+
+        self.assertIs(view.nested_query_params, data)
+
+    def test_cached_across_requests(self):
+        first = get_nested_query_params(self.get_request())
+        first['filter']['tags'].append('c')
+        second = get_nested_query_params(self.get_request())
+
+        self.assertEqual(second['filter']['tags'], ['a', 'b'])
+        self.assertEqual(query_cache.info()['hits'], 1)
+        self.assertEqual(query_cache.info()['misses'], 1)
+
+    def test_disabled_cache(self):
+        cache = QueryCache(0)
+        data = cache.decode(b'item[0]=1', 'utf-8')
+
+        self.assertEqual(data, {'item': [1]})
+        self.assertEqual(cache.info()['maxsize'], 0)
+
+    def test_invalid_query_params(self):
+        with self.assertRaises(ParseError):
+            get_nested_query_params(self.get_request('item[0]=1&item[5000]=2'))
+
+    def test_copy_tree(self):
+        tree = {'item': [{'tags': ['a']}, None, {}], 'count': 1}
+        copied = copy_tree(tree)
+
+        self.assertEqual(copied, tree)
+        self.assertIsNot(copied['item'], tree['item'])
+        self.assertIsNot(copied['item'][0]['tags'], tree['item'][0]['tags'])
+        self.assertEqual(copy_tree('value'), 'value')
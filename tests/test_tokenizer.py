@@ -0,0 +1,187 @@
+import time
+import unittest
+
+from drf_nested_forms.mixins import UtilityMixin
+from drf_nested_forms.tokenizer import (
+    APPEND, DICT, LIST, NON_NESTED, OTHER, KeyCache, Token,
+    is_dict_step, is_nested_key, tokenize_key
+)
+from drf_nested_forms.utils import NestedForm
+
+
+class TokenizerTestCase(unittest.TestCase):
+
+    def test_namespaced_key(self):
+        """
+        namespace is split from the typed steps
+        """
+        parsed = tokenize_key('item[attribute][0][user_type][]')
+
+        self.assertTrue(parsed.nested)
+        self.assertEqual(parsed.namespace, 'item')
+        self.assertEqual(parsed.stripped, '[attribute][0][user_type][]')
+        self.assertEqual(parsed.group, 'item')
+        self.assertEqual(parsed.steps, (
+            Token(DICT, 'attribute'),
+            Token(LIST, 0),
+            Token(DICT, 'user_type'),
+            Token(APPEND, 0),
+        ))
+
+    def test_group_of_key(self):
+        """
+        keys without a namespace are grouped by their first step
+        """
+        self.assertEqual(tokenize_key('[0][attribute]').group, LIST)
+        self.assertEqual(tokenize_key('[attribute][0]').group, DICT)
+        self.assertEqual(tokenize_key('[][attribute]').group, NON_NESTED)
+        self.assertEqual(tokenize_key('attribute').group, NON_NESTED)
+
+    def test_non_nested_key(self):
+        """
+        keys that do not end with a bracket are not nested
+        """
+        for key in ('attribute', 'item[', '[attribute', 'item[a]\n[b]', ']'):
+            self.assertFalse(tokenize_key(key).nested, key)
+            self.assertEqual(tokenize_key(key).steps, ())
+
+    def test_dict_step_with_digits(self):
+        """
+        a step containing anything but digits is a dict key
+        """
+        parsed = tokenize_key('[-1][1.5][ 2]')
+
+        self.assertEqual(
+            [step.kind for step in parsed.steps], [DICT, DICT, DICT]
+        )
+        self.assertEqual(
+            [step.index for step in parsed.steps], ['-1', '1.5', ' 2']
+        )
+
+    def test_malformed_step(self):
+        """
+        a step that does not open with a bracket keeps its first number
+        """
+        parsed = tokenize_key('foo-bar[a]')
+
+        self.assertIsNone(parsed.namespace)
+        self.assertEqual(parsed.steps, (Token(OTHER, None),))
+
+
+class KeyCacheTestCase(unittest.TestCase):
+
+    def test_hits_and_misses(self):
+        """
+        a warm key is served from the cache
+        """
+        cache = KeyCache(maxsize=8)
+
+        first = cache.tokenize('variants[3][prices][0][amount]')
+        second = cache.tokenize('variants[3][prices][0][amount]')
+
+        self.assertIs(first, second)
+        self.assertEqual(cache.info()['hits'], 1)
+        self.assertEqual(cache.info()['misses'], 1)
+
+    def test_eviction(self):
+        """
+        the cache never grows beyond its size limit
+        """
+        cache = KeyCache(maxsize=2)
+
+        for key in ('a[0]', 'b[0]', 'c[0]', 'a[0]'):
+            cache.tokenize(key)
+
+        self.assertEqual(cache.info()['currsize'], 2)
+        self.assertEqual(cache.info()['hits'], 0)
+
+    def test_long_keys(self):
+        """
+        keys over `max_key_length` are parsed but never kept
+        """
+        cache = KeyCache(maxsize=8, max_key_length=16)
+        key = 'item' + '[a]' * 100
+
+        self.assertEqual(cache.tokenize(key), tokenize_key(key))
+        self.assertEqual(cache.info()['currsize'], 0)
+
+        cache.tokenize('item[a]')
+
+        self.assertEqual(cache.info()['currsize'], 1)
+
+    def test_disabled_cache(self):
+        """
+        a size of `0` parses keys on every call
+        """
+        cache = KeyCache(maxsize=0)
+
+        self.assertEqual(cache.tokenize('a[0]'), tokenize_key('a[0]'))
+        self.assertEqual(cache.info()['currsize'], 0)
+
+
+class AdversarialKeyTestCase(unittest.TestCase):
+    """
+    Keys that made the old regular expressions backtrack for minutes
+    are classified in linear time
+    """
+    size = 100000
+    time_limit = 1.0
+
+    def corpus(self):
+        size = self.size
+
+        return [
+            '[' + 'a' * size,
+            '[' + '1a' * (size // 2),
+            '[' + 'a1' * (size // 2) + '\n',
+            '[' * size,
+            ']' * size,
+            '[]' * (size // 2) + '\n',
+            'a' * size + '[',
+            'item' + '[a' * (size // 2),
+            '[a]' * (size // 3) + 'a',
+            '[0]' * (size // 3) + '\n]',
+            '[' + '-' * size + ']',
+        ]
+
+    def assertFast(self, function):
+        start = time.perf_counter()
+        function()
+        self.assertLess(time.perf_counter() - start, self.time_limit)
+
+    def test_classification(self):
+        mixin = UtilityMixin()
+
+        for key in self.corpus():
+            self.assertFast(lambda: is_nested_key(key))
+            self.assertFast(lambda: is_dict_step(key))
+            self.assertFast(lambda: mixin.str_is_nested(key))
+            self.assertFast(lambda: mixin.str_is_dict(key))
+            self.assertFast(lambda: tokenize_key(key))
+
+    def test_nested_form(self):
+        """
+        a form of adversarial keys is decoded in linear time
+        """
+        data = {key: 'value' for key in self.corpus()}
+
+        def decode():
+            form = NestedForm(data)
+            form.is_nested()
+
+        self.assertFast(decode)
+
+    def test_same_as_regular_expressions(self):
+        """
+        the classification matches the replaced regular expressions
+        """
+        for key in ('item[0]', '[a]', '[]', 'item[', '[a]\n', ']', 'a[]'):
+            self.assertEqual(is_nested_key(key), key not in (
+                'item[', '[a]\n', ']'
+            ), key)
+
+        for step in ('[a]', '[-1]', '[1a]', '[]]', '[\n]'):
+            self.assertTrue(is_dict_step(step), step)
+
+        for step in ('[0]', '[12]', '[]', '[a', 'a]', ''):
+            self.assertFalse(is_dict_step(step), step)